@@ -0,0 +1,166 @@
+import random
+import numpy as np
+import fitness_engine
+import genetic_algorithm
+
+
+def compile_batch(instances):
+    """
+    pads compiled instances into common arrays, so that all of them are evaluated at once.
+    Padding variable (the last column) is always 0, it fills shorter clauses with false literals,
+    padding clauses are masked out.
+    :param instances: list of dictionaries, which represent instances of problem
+    :return: a dictionary with rows of variables of literals (clause after clause, instance after instance)
+    in population transposed to (instance and variable, individual), their polarities, width of clauses,
+    mask of real clauses, weights (instance, variable), numbers of variables and clauses
+    """
+    compiled = [fitness_engine.get_compiled(instance) for instance in instances]
+    n_var = np.array([item['n_var'] for item in compiled])
+    n_clauses = np.array([item['n_clauses'] for item in compiled])
+    lengths = [np.diff(np.append(item['offsets'], len(item['literals']))) for item in compiled]
+    max_var, max_clauses = int(n_var.max()), int(n_clauses.max())
+    width = max([int(item.max()) for item in lengths if len(item) > 0], default=1)
+
+    indices = np.full((len(instances), max_clauses, width), max_var, dtype=np.int64)
+    polarities = np.ones((len(instances), max_clauses, width), dtype=np.uint8)
+    weights = np.zeros((len(instances), max_var + 1), dtype=np.int64)
+    for number, item in enumerate(compiled):
+        clause_of_literal = np.repeat(np.arange(item['n_clauses']), lengths[number])
+        position = np.arange(len(item['literals'])) - np.asarray(item['offsets'])[clause_of_literal]
+        indices[number, clause_of_literal, position] = item['indices']
+        polarities[number, clause_of_literal, position] = item['polarities']
+        weights[number, :item['n_var']] = item['weights']
+    rows = indices + (np.arange(len(instances)) * (max_var + 1))[:, None, None]
+    return {'rows': rows.ravel(), 'polarities': polarities.reshape(-1, 1), 'width': width, 'clause_mask': np.arange(max_clauses) < n_clauses[:, None], 'weights': weights,
+            'n_var': n_var, 'n_clauses': n_clauses}
+
+
+def evaluate_batch(population, batch, satisfied_clause_bonus, satisfied_formula_bonus):
+    """
+    calculates fitness function of all individuals of all instances at once
+    :param population: array of 0 and 1 of shape (instance, individual, variable)
+    :param batch: compiled batch of instances
+    :return: a dictionary with arrays (instance, individual) of weights sums, numbers of satisfied clauses and fitnesses
+    """
+    n_instances, n_individuals, size = population.shape
+    # whole rows of individuals are gathered for each literal, which is much faster than gathering single values
+    columns = np.ascontiguousarray(population.transpose(0, 2, 1)).reshape(n_instances * size, n_individuals)
+    true_literals = (columns[batch['rows']] == batch['polarities']).reshape(n_instances, -1, batch['width'],
+                                                                           n_individuals)
+    satisfied_clauses = true_literals[:, :, 0]
+    for position in range(1, batch['width']):
+        satisfied_clauses = satisfied_clauses | true_literals[:, :, position]
+    satisfied = (satisfied_clauses & batch['clause_mask'][:, :, None]).sum(axis=1)
+    weights_sums = np.einsum('ijk,ik->ij', population, batch['weights'])
+    fitnesses = weights_sums + satisfied * satisfied_clause_bonus
+    fitnesses[satisfied == batch['n_clauses'][:, None]] += satisfied_formula_bonus
+    return {'weights_sums': weights_sums, 'satisfied': satisfied, 'fitnesses': fitnesses}
+
+
+def selection_by_tournament(population, fitnesses, tournament_size, generator):
+    """
+    returns population selected by tournaments with linear scaling, independently for each instance
+    """
+    n_instances, n_individuals = fitnesses.shape
+    z_min, z_max = fitnesses.min(axis=1, keepdims=True), fitnesses.max(axis=1, keepdims=True)
+    spread = np.where(z_max > z_min, z_max - z_min, 1)
+    scaled = np.where(z_max > z_min, 100 + (fitnesses - z_min) * 100 // spread, 1)
+
+    tournaments = generator.integers(0, n_individuals, size=(n_instances, n_individuals, tournament_size))
+    contestants = np.take_along_axis(scaled, tournaments.reshape(n_instances, -1), axis=1)
+    best = contestants.reshape(tournaments.shape).argmax(axis=2)
+    winners = np.take_along_axis(tournaments, best[:, :, None], axis=2)[:, :, 0]
+    return np.take_along_axis(population, winners[:, :, None], axis=1)
+
+
+def crossover_batch(population, probability, n_var, generator):
+    """
+    performs one point crossover of pairs of neighbouring individuals in place, point is drawn within real variables
+    of instance
+    """
+    n_instances, n_individuals, size = population.shape
+    n_pairs = n_individuals // 2
+    points = (generator.random((n_instances, n_pairs)) * n_var[:, None]).astype(np.int64)
+    crossed = generator.random((n_instances, n_pairs)) < probability
+    tails = (np.arange(size) >= points[:, :, None]) & crossed[:, :, None]
+    first, second = population[:, 0:2 * n_pairs:2], population[:, 1:2 * n_pairs:2]
+    swapped = np.where(tails, second, first)
+    population[:, 1:2 * n_pairs:2] = np.where(tails, first, second)
+    population[:, 0:2 * n_pairs:2] = swapped
+
+
+def mutation_batch(population, probability, n_var, generator):
+    """
+    flips one random real variable of individuals in place, each individual is mutated with given probability
+    """
+    n_instances, n_individuals = population.shape[:2]
+    variables = (generator.random((n_instances, n_individuals)) * n_var[:, None]).astype(np.int64)
+    mutated = (generator.random((n_instances, n_individuals)) < probability) & (n_var[:, None] > 0)
+    instance_index, individual_index = np.nonzero(mutated)
+    population[instance_index, individual_index, variables[instance_index, individual_index]] ^= 1
+
+
+def run_and_set_bonuses(instances, n_individuals, n_iterations, crossover_probability, mutation_probability,
+                        satisfied_clause_bonus, satisfied_formula_bonus, stop_on_valid=False, tournament_size=None,
+                        seed=None):
+    """
+    runs genetic algorithm for all instances together, generations of all instances are advanced by the same
+    array operations on population of shape (instance, individual, variable)
+    :param instances: list of dictionaries, which represent instances of problem
+    :param stop_on_valid: stop as soon as every instance has valid individual
+    :param tournament_size: number of individuals in each tournament of selection,
+    genetic_algorithm.TOURNAMENT_SIZE if None
+    :param seed: seed of numpy random generator of the run, seeded from random module if None
+    :return: list with the best valid individual found for each instance, with generation, at which algorithm
+    stopped. None for instances without solution.
+    """
+    if not instances:
+        return []
+    batch = compile_batch(instances)
+    n_var, n_clauses = batch['n_var'], batch['n_clauses']
+    # one numpy generator for whole run, random module is only used to seed it
+    generator = np.random.default_rng(random.getrandbits(64) if seed is None else seed)
+    if tournament_size is None:
+        tournament_size = genetic_algorithm.TOURNAMENT_SIZE
+
+    variable_mask = (np.arange(batch['weights'].shape[1]) < n_var[:, None]).astype(np.uint8)
+    population = generator.integers(0, 2, size=(len(instances), n_individuals, batch['weights'].shape[1]),
+                                    dtype=np.uint8) & variable_mask[:, None, :]
+    archive_individuals = np.zeros((len(instances), batch['weights'].shape[1]), dtype=np.uint8)
+    archive_weights_sums = np.full(len(instances), -1, dtype=np.int64)
+    iteration = 0
+    while True:
+        evaluation = evaluate_batch(population, batch, satisfied_clause_bonus, satisfied_formula_bonus)
+        valid_weights_sums = np.where(evaluation['satisfied'] == n_clauses[:, None], evaluation['weights_sums'], -1)
+        best = valid_weights_sums.argmax(axis=1)
+        best_weights_sums = valid_weights_sums[np.arange(len(instances)), best]
+        improved = best_weights_sums > archive_weights_sums
+        archive_weights_sums[improved] = best_weights_sums[improved]
+        archive_individuals[improved] = population[improved, best[improved]]
+
+        if iteration >= n_iterations or (stop_on_valid and np.all(archive_weights_sums >= 0)):
+            break
+        population = selection_by_tournament(population, evaluation['fitnesses'], max(1, tournament_size), generator)
+        crossover_batch(population, crossover_probability, n_var, generator)
+        mutation_batch(population, mutation_probability, n_var, generator)
+        iteration += 1
+
+    solutions = []
+    for number, instance in enumerate(instances):
+        if archive_weights_sums[number] < 0:
+            solutions.append(None)
+        else:
+            solutions.append({'individual': archive_individuals[number, :instance['n_var']].tolist(),
+                              'weights_sum': int(archive_weights_sums[number]), 'generation': iteration})
+    return solutions
+
+
+def run(instances, n_individuals, n_iterations, crossover_probability, mutation_probability, **options):
+    """
+    runs genetic algorithm for all instances together, with the same bonuses as genetic_algorithm.run
+    :param options: optional settings passed to run_and_set_bonuses
+    :return: list of solutions, None for instances without solution
+    """
+    satisfied_clause_bonus, satisfied_formula_bonus = 500, 1100
+    return run_and_set_bonuses(instances, n_individuals, n_iterations, crossover_probability, mutation_probability,
+                               satisfied_clause_bonus, satisfied_formula_bonus, **options)
@@ -0,0 +1,178 @@
+import argparse
+import csv
+import datetime
+import glob
+import json
+import os
+import platform
+import random
+import sys
+from time import perf_counter
+import numpy as np
+import genetic_algorithm
+import instance_cache
+import parallel_runner
+
+DEFAULT_PARAMETERS = {'n_individuals': 50, 'n_iterations': 500, 'crossover_probability': 0.7,
+                      'mutation_probability': 0.06}
+
+# named scenarios: options of genetic_algorithm.run compared by solved ratio and time per size of instances
+SCENARIOS = {
+    'default': {},
+    'one_point_crossover': {'crossover_type': 'one_point'},
+    'uniform_crossover': {'crossover_type': 'uniform'},
+    'tournament_selection': {'selection_type': 'tournament'},
+    'roulette_selection': {'selection_type': 'roulette'},
+    'universal_selection': {'selection_type': 'universal'},
+    'packed': {'representation': 'packed'},
+    'incremental': {'representation': 'incremental'},
+    'buffered': {'representation': 'buffered'},
+}
+
+
+def discover_instances(source):
+    """
+    finds instance files and groups them by number of clauses
+    :param source: glob pattern of filenames or path to manifest.json written by instance_generator
+    :return: structured array of sizes of instances and filenames, as used by main.meassure_performance
+    """
+    if source.endswith('.json'):
+        with open(source, mode='r', encoding='utf-8') as a_file:
+            manifest = json.load(a_file)
+        folder = os.path.dirname(source)
+        pairs = [(record['n_clauses'], os.path.join(folder, record['filename'])) for record in manifest['instances']]
+    else:
+        pairs = [(instance_cache.load_instance(filename)['n_clauses'], filename) for filename in glob.glob(source)]
+
+    # files are ordered by their index, so that '..._10.txt' comes after '..._9.txt'
+    sizes = {}
+    for n, filename in sorted(pairs, key=lambda pair: (pair[0], len(pair[1]), pair[1])):
+        sizes.setdefault(n, []).append(filename)
+    return sorted(sizes.items())
+
+
+def hardware_metadata():
+    """
+    returns description of machine and software, which produced results
+    """
+    return {'platform': platform.platform(), 'processor': platform.processor(), 'cpu_count': os.cpu_count(),
+            'python': platform.python_version(), 'numpy': np.__version__,
+            'time': datetime.datetime.now().isoformat(timespec='seconds')}
+
+
+def run_benchmark_job(filename, seed, parameters, options):
+    """
+    solves instance from file with seeded random generator, used as a job of parallel runner
+    :return: True if solution was found and runtime in seconds
+    """
+    random.seed(seed)
+    instance = instance_cache.load_instance(filename)
+    t0 = perf_counter()
+    solution = genetic_algorithm.run(instance, parameters['n_individuals'], parameters['n_iterations'],
+                                     parameters['crossover_probability'], parameters['mutation_probability'],
+                                     **options)
+    return solution is not None, perf_counter() - t0
+
+
+def run_scenario(name, filenames_all, parameters=None, seed=0, n_repetitions=1, n_workers=1):
+    """
+    runs named scenario on all instances
+    :param name: name of scenario from SCENARIOS
+    :param filenames_all: structured array of sizes of instances and filenames
+    :param parameters: parameters of GA, DEFAULT_PARAMETERS if None
+    :param seed: seed, from which seeds of jobs are derived
+    :param n_repetitions: how many times each instance is solved
+    :param n_workers: number of processes solving instances in parallel (more than 1 makes times less precise)
+    :return: a dictionary with scenario, its settings, hardware metadata and results per size of instances
+    """
+    if parameters is None:
+        parameters = DEFAULT_PARAMETERS
+    options = SCENARIOS[name]
+    jobs, sizes = [], {}
+    for n, filenames in filenames_all:
+        sizes[n] = {'n_clauses': n, 'runs': 0, 'solved': 0, 'seconds': 0.0}
+        for repetition in range(n_repetitions):
+            for filename in filenames:
+                jobs.append((filename, parallel_runner.derive_seed(seed, len(jobs)), parameters, options))
+    sizes_of_files = {filename: n for n, filenames in filenames_all for filename in filenames}
+
+    for job, (solved, seconds) in parallel_runner.run_jobs(run_benchmark_job, jobs, n_workers):
+        size = sizes[sizes_of_files[job[0]]]
+        size['runs'] += 1
+        size['solved'] += solved
+        size['seconds'] += seconds
+
+    results = []
+    for n, filenames in filenames_all:
+        size = sizes[n]
+        results.append({'n_clauses': n, 'runs': size['runs'], 'solved_ratio': size['solved'] / size['runs'],
+                        'mean_seconds': size['seconds'] / size['runs']})
+        print(name, n, ': ', results[-1]['solved_ratio'], results[-1]['mean_seconds'], 's')
+    return {'scenario': name, 'parameters': parameters, 'options': options, 'seed': seed,
+            'n_repetitions': n_repetitions, 'metadata': hardware_metadata(), 'results': results}
+
+
+def write_results(runs, filename):
+    """
+    writes results of scenarios to JSON, or to CSV (one row per scenario and size) if filename ends with .csv
+    """
+    with open(filename, mode='w', encoding='utf-8', newline='') as a_file:
+        if not filename.endswith('.csv'):
+            json.dump(runs, a_file, indent=1)
+            return
+        writer = csv.writer(a_file)
+        writer.writerow(['scenario', 'n_clauses', 'runs', 'solved_ratio', 'mean_seconds'])
+        for run in runs:
+            for result in run['results']:
+                writer.writerow([run['scenario'], result['n_clauses'], result['runs'], result['solved_ratio'],
+                                 result['mean_seconds']])
+
+
+def compare(runs, baseline, time_tolerance=0.1, ratio_tolerance=0.05):
+    """
+    compares results with baseline results of the same scenarios
+    :param runs: list of results of scenarios
+    :param baseline: list of results of scenarios stored earlier (by write_results to JSON)
+    :param time_tolerance: allowed relative growth of mean time
+    :param ratio_tolerance: allowed absolute drop of solved ratio
+    :return: list of descriptions of regressions, empty if there are none
+    """
+    baseline_results = {(run['scenario'], result['n_clauses']): result for run in baseline for result in run['results']}
+    regressions = []
+    for run in runs:
+        for result in run['results']:
+            old = baseline_results.get((run['scenario'], result['n_clauses']))
+            if old is None:
+                continue
+            if result['mean_seconds'] > old['mean_seconds'] * (1 + time_tolerance):
+                regressions.append(run['scenario'] + ' ' + str(result['n_clauses']) + ': time ' +
+                                   str(old['mean_seconds']) + ' s -> ' + str(result['mean_seconds']) + ' s')
+            if result['solved_ratio'] < old['solved_ratio'] - ratio_tolerance:
+                regressions.append(run['scenario'] + ' ' + str(result['n_clauses']) + ': solved ratio ' +
+                                   str(old['solved_ratio']) + ' -> ' + str(result['solved_ratio']))
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Runs benchmark scenarios of genetic algorithm')
+    parser.add_argument('scenarios', nargs='*', default=['default'], choices=sorted(SCENARIOS))
+    parser.add_argument('--instances', default='./instances/3_SAT_*.txt', help='glob pattern or manifest.json')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repetitions', type=int, default=1)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--output', help='file for results, .json or .csv')
+    parser.add_argument('--baseline', help='results in .json to compare with')
+    arguments = parser.parse_args()
+
+    filenames_all = discover_instances(arguments.instances)
+    runs = [run_scenario(name, filenames_all, seed=arguments.seed, n_repetitions=arguments.repetitions,
+                         n_workers=arguments.workers) for name in arguments.scenarios]
+    if arguments.output is not None:
+        write_results(runs, arguments.output)
+    if arguments.baseline is not None:
+        with open(arguments.baseline, mode='r', encoding='utf-8') as a_file:
+            regressions = compare(runs, json.load(a_file))
+        for regression in regressions:
+            print('Regression:', regression)
+        if regressions:
+            sys.exit(1)
@@ -0,0 +1,47 @@
+import json
+import os
+import numpy as np
+
+
+def save_checkpoint(filename, population, state):
+    """
+    saves checkpoint of genetic algorithm, file is replaced only when the new one is completely written
+    :param filename: filename, .npz
+    :param population: population as list of individuals (lists of 0 and 1), saved packed into bits
+    :param state: a dictionary with generation, archive, random state and other progress of run, saved as JSON
+    """
+    matrix = np.asarray(population, dtype=np.uint8).reshape(len(population), -1)
+    temporary = filename + '.tmp'
+    with open(temporary, mode='wb') as a_file:
+        np.savez_compressed(a_file, population=np.packbits(matrix, axis=1, bitorder='little'),
+                            individual_size=matrix.shape[1], state=json.dumps(state))
+    os.replace(temporary, filename)
+
+
+def load_checkpoint(filename):
+    """
+    loads checkpoint saved by save_checkpoint
+    :return: population as list of individuals and a dictionary with progress of run. None if there is no checkpoint.
+    """
+    if not os.path.exists(filename):
+        return None
+    with np.load(filename) as data:
+        matrix = np.unpackbits(data['population'], axis=1, count=int(data['individual_size']), bitorder='little')
+        state = json.loads(str(data['state']))
+    return matrix.tolist(), state
+
+
+def random_state_to_json(random_state):
+    """
+    returns state of random generator (random.Random) as lists, so that it can be saved as JSON
+    """
+    version, internal_state, gauss_next = random_state
+    return [version, list(internal_state), gauss_next]
+
+
+def random_state_from_json(random_state):
+    """
+    returns state of random generator loaded from JSON, accepted by random.Random.setstate
+    """
+    version, internal_state, gauss_next = random_state
+    return version, tuple(internal_state), gauss_next
@@ -0,0 +1,170 @@
+import bz2
+import gzip
+import lzma
+import numpy as np
+import fitness_engine
+
+EXTENSIONS = ['.cnf', '.wcnf']
+COMPRESSIONS = {'.gz': gzip.open, '.xz': lzma.open, '.bz2': bz2.open}
+
+
+def split_extension(filename):
+    """
+    returns extension of DIMACS file (.cnf, .wcnf or '' for other files) and its compression ('' if not compressed)
+    """
+    name, compression = filename.lower(), ''
+    for extension in COMPRESSIONS:
+        if name.endswith(extension):
+            name, compression = name[:-len(extension)], extension
+    for extension in EXTENSIONS:
+        if name.endswith(extension):
+            return extension, compression
+    return '', compression
+
+
+def is_dimacs(filename):
+    """
+    returns True if file is in DIMACS CNF or WCNF format (possibly compressed), judging by its extension
+    """
+    return split_extension(filename)[0] != ''
+
+
+def open_file(filename, mode):
+    """
+    opens text file, compressed files (.gz, .xz, .bz2) are decompressed or compressed on the fly
+    """
+    compression = split_extension(filename)[1]
+    if compression == '':
+        return open(filename, mode=mode, encoding='utf-8')
+    return COMPRESSIONS[compression](filename, mode=mode + 't', encoding='utf-8')
+
+
+def read_dimacs(filename, chunk_size=1 << 22, default_weight=1):
+    """
+    reads DIMACS CNF or WCNF file chunk by chunk, without holding whole text in memory.
+    Weighted problem (maximize sum of weights of True variables) is read from WCNF as hard clauses
+    and soft positive unit clauses 'w i 0', which give weight w to variable i. Weights in CNF are read from comment
+    'c weights w1 w2 ...' written by write_dimacs, otherwise all variables have default weight.
+    :param filename: filename
+    :param chunk_size: number of characters read at once
+    :param default_weight: weight of variables, which have no weight in file
+    :return: compiled instance, see fitness_engine.compile_arrays
+    """
+    weighted = split_extension(filename)[0] == '.wcnf'
+    header, weights_comment = None, None
+    literals, lengths, clause_weights = [], [], []
+    pending, remainder, finished = np.zeros(0, dtype=np.int64), '', False
+
+    with open_file(filename, 'r') as a_file:
+        while not finished:
+            chunk = a_file.read(chunk_size)
+            text = remainder + chunk
+            if chunk:
+                cut = text.rfind('\n') + 1
+                text, remainder = text[:cut], text[cut:]
+            else:
+                finished = True
+
+            body = []
+            for line in text.splitlines():
+                line = line.strip()
+                if line == '':
+                    continue
+                if line[0] == '%':
+                    # end of data in SATLIB files
+                    finished = True
+                    break
+                if line[0] == 'c':
+                    if line.startswith('c weights'):
+                        weights_comment = line.split()[2:]
+                    continue
+                if line[0] == 'p':
+                    header = line.split()
+                    continue
+                if line[0] == 'h':
+                    # hard clause of new WCNF format, weight -1 marks it
+                    line = '-1' + line[1:]
+                body.append(line)
+
+            tokens = np.concatenate([pending, np.array(' '.join(body).split(), dtype=np.int64)])
+            ends = np.flatnonzero(tokens == 0)
+            if len(ends) > 0:
+                complete, pending = tokens[:ends[-1] + 1], tokens[ends[-1] + 1:]
+                starts = np.append(0, ends[:-1] + 1)
+                keep = complete != 0
+                if weighted:
+                    clause_weights.append(complete[starts])
+                    keep[starts] = False
+                literals.append(complete[keep].astype(np.int32))
+                lengths.append(ends - starts + 1 - (2 if weighted else 1))
+            else:
+                pending = tokens
+
+    literals = np.concatenate(literals) if literals else np.zeros(0, dtype=np.int32)
+    lengths = np.concatenate(lengths) if lengths else np.zeros(0, dtype=np.int64)
+    n_var = int(header[2]) if header is not None else int(np.abs(literals).max(initial=0))
+
+    if weighted:
+        clause_weights = np.concatenate(clause_weights) if clause_weights else np.zeros(0, dtype=np.int64)
+        literals, lengths, weights = split_soft_clauses(literals, lengths, clause_weights, header, n_var)
+    elif weights_comment is not None:
+        weights = [int(x) for x in weights_comment]
+    else:
+        weights = [default_weight] * n_var
+
+    offsets = np.zeros(len(lengths), dtype=np.int64)
+    np.cumsum(lengths[:-1], out=offsets[1:])
+    return fitness_engine.compile_arrays(n_var, len(lengths), literals, offsets, weights)
+
+
+def split_soft_clauses(literals, lengths, clause_weights, header, n_var):
+    """
+    separates hard clauses of WCNF from soft ones and turns soft positive unit clauses into weights of variables
+    :return: literals of hard clauses, their lengths and weights of variables
+    """
+    if header is not None and len(header) > 4:
+        hard = (clause_weights == -1) | (clause_weights >= int(header[4]))
+    else:
+        hard = clause_weights == -1
+    clause_of_literal = np.repeat(np.arange(len(lengths)), lengths)
+
+    soft = ~hard
+    soft_literals = literals[soft[clause_of_literal]]
+    if np.any(lengths[soft] != 1) or np.any(soft_literals < 0):
+        raise ValueError('Only soft clauses, which are positive unit clauses (weights of variables), are supported')
+    weights = np.zeros(n_var, dtype=np.int64)
+    np.add.at(weights, soft_literals - 1, clause_weights[soft])
+    return literals[hard[clause_of_literal]], lengths[hard], weights.tolist()
+
+
+def write_dimacs(instance, filename, weighted=None, batch_size=10000):
+    """
+    writes instance to DIMACS file in batches of clauses. Weights of variables are written as soft unit clauses
+    to WCNF and as comment 'c weights ...' to CNF.
+    :param instance: a dictionary, which represents an instance of problem
+    :param filename: filename, ending .gz, .xz or .bz2 compresses it
+    :param weighted: write WCNF if True, CNF if False, decided by extension of filename if None
+    :param batch_size: number of clauses formatted and written at once
+    """
+    if weighted is None:
+        weighted = split_extension(filename)[0] == '.wcnf'
+    n_var, clauses, weights = instance['n_var'], instance['clauses'], instance['weights']
+    # zero weight would end soft clause, such variables are simply left out
+    weighted_vars = [index for index in range(n_var) if weights[index] != 0]
+
+    with open_file(filename, 'w') as a_file:
+        if weighted:
+            top = sum(weights) + 1
+            a_file.write('p wcnf ' + str(n_var) + ' ' + str(len(clauses) + len(weighted_vars)) + ' ' + str(top) + '\n')
+            prefix = str(top) + ' '
+        else:
+            a_file.write('c weights ' + ' '.join(str(weight) for weight in weights) + '\n')
+            a_file.write('p cnf ' + str(n_var) + ' ' + str(len(clauses)) + '\n')
+            prefix = ''
+        for start in range(0, len(clauses), batch_size):
+            a_file.write(''.join(prefix + ' '.join(str(var) for var in clause) + ' 0\n'
+                                 for clause in clauses[start:start + batch_size]))
+        if weighted:
+            for start in range(0, len(weighted_vars), batch_size):
+                a_file.write(''.join(str(weights[index]) + ' ' + str(index + 1) + ' 0\n'
+                                     for index in weighted_vars[start:start + batch_size]))
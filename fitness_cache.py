@@ -0,0 +1,66 @@
+import collections
+import numpy as np
+
+
+def create_cache(max_size=100000):
+    """
+    returns cache of fitness of individuals with LRU eviction, pass it to genetic_algorithm.run.
+    Cache belongs to one instance and it is emptied when it is used for other instance or other bonuses.
+    :param max_size: the highest number of individuals in cache
+    :return: a dictionary, which represents cache
+    """
+    return {'entries': collections.OrderedDict(), 'max_size': max_size, 'hits': 0, 'misses': 0,
+            'instance': None, 'bonuses': None}
+
+
+def cached_evaluate(cache, instance, evaluate, key):
+    """
+    returns function evaluating population, which evaluates only individuals missing in cache
+    and each distinct individual only once
+    :param cache: cache
+    :param instance: a dictionary, which represents an instance of problem
+    :param evaluate: function evaluating population (see genetic_algorithm.get_operators)
+    :param key: function, which returns hashable genome of individual
+    """
+    def evaluate_population(population, satisfied_clause_bonus, satisfied_formula_bonus):
+        if cache['instance'] is not instance or cache['bonuses'] != (satisfied_clause_bonus, satisfied_formula_bonus):
+            cache['entries'].clear()
+            cache['instance'], cache['bonuses'] = instance, (satisfied_clause_bonus, satisfied_formula_bonus)
+        entries = cache['entries']
+
+        keys = [key(individual) for individual in population]
+        found, missing = {}, {}
+        for index, genome_key in enumerate(keys):
+            if genome_key in found or genome_key in missing:
+                continue
+            entry = entries.get(genome_key)
+            if entry is None:
+                missing[genome_key] = index
+            else:
+                entries.move_to_end(genome_key)
+                found[genome_key] = entry
+        cache['misses'] += len(missing)
+        cache['hits'] += len(population) - len(missing)
+
+        if missing:
+            evaluation = evaluate([population[index] for index in missing.values()], satisfied_clause_bonus,
+                                  satisfied_formula_bonus)
+            for genome_key, weights_sum, satisfied, fitness in zip(missing, evaluation['weights_sums'].tolist(),
+                                                                   evaluation['satisfied'].tolist(),
+                                                                   evaluation['fitnesses'].tolist()):
+                found[genome_key] = entries[genome_key] = (weights_sum, satisfied, fitness)
+            while len(entries) > cache['max_size']:
+                entries.popitem(last=False)
+
+        values = np.array([found[genome_key] for genome_key in keys], dtype=np.int64).reshape(len(keys), 3)
+        return {'weights_sums': values[:, 0], 'satisfied': values[:, 1], 'fitnesses': values[:, 2]}
+    return evaluate_population
+
+
+def report(cache):
+    """
+    returns numbers of hits and misses of cache and share of hits
+    """
+    total = cache['hits'] + cache['misses']
+    return {'hits': cache['hits'], 'misses': cache['misses'], 'hit_ratio': cache['hits'] / total if total > 0 else 0.0,
+            'size': len(cache['entries'])}
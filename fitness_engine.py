@@ -0,0 +1,86 @@
+import numpy as np
+
+
+def compile_instance(instance):
+    """
+    compiles clauses of instance once into flat arrays of variable indices and polarities,
+    so that a whole population can be evaluated at once
+    :param instance: a dictionary, which represents an instance of problem
+    :return: a dictionary, which represents compiled instance
+    """
+    clauses = instance['clauses']
+    lengths = np.fromiter((len(clause) for clause in clauses), dtype=np.int64, count=len(clauses))
+    literals = np.fromiter((var for clause in clauses for var in clause), dtype=np.int32, count=int(lengths.sum()))
+    offsets = np.zeros(len(clauses), dtype=np.int64)
+    np.cumsum(lengths[:-1], out=offsets[1:])
+    return compile_arrays(instance['n_var'], instance['n_clauses'], literals, offsets, instance['weights'])
+
+
+def compile_arrays(n_var, n_clauses, literals, offsets, weights):
+    """
+    builds compiled instance from flat array of literals and offsets of clauses in it
+    :param n_var: number of variables
+    :param n_clauses: number of clauses
+    :param literals: flat array of signed literals of all clauses
+    :param offsets: index of first literal of each clause in literals
+    :param weights: weights of variables
+    :return: a dictionary, which represents compiled instance
+    """
+    literals = np.asarray(literals, dtype=np.int32)
+    offsets = np.asarray(offsets, dtype=np.int64)
+    lengths = np.diff(np.append(offsets, len(literals)))
+    # clauses of equal length (3 SAT) are evaluated by reshaping instead of reduceat
+    width = int(lengths[0]) if len(lengths) > 0 and np.all(lengths == lengths[0]) else None
+    indices = np.abs(literals) - 1
+
+    # occurrence index: clauses of variable i are occurrence_clauses[occurrence_offsets[i]:occurrence_offsets[i+1]]
+    order = np.argsort(indices, kind='stable')
+    occurrence_clauses = np.repeat(np.arange(len(offsets), dtype=np.int32), lengths)[order]
+    occurrence_offsets = np.searchsorted(indices[order], np.arange(n_var + 1))
+
+    return {'n_var': n_var, 'n_clauses': n_clauses, 'literals': literals, 'offsets': offsets,
+            'indices': indices, 'polarities': (literals > 0).astype(np.uint8),
+            'width': width, 'weights': np.asarray(weights, dtype=np.int64),
+            'occurrence_offsets': occurrence_offsets, 'occurrence_clauses': occurrence_clauses}
+
+
+def get_compiled(instance):
+    """
+    returns compiled instance, which was loaded together with instance, or compiles it
+    """
+    if 'compiled' in instance:
+        return instance['compiled']
+    return compile_instance(instance)
+
+
+def population_matrix(population):
+    """
+    returns population as a matrix of bits, one row per individual
+    """
+    return np.asarray(population, dtype=np.uint8)
+
+
+def satisfied_clauses_matrix(matrix, compiled):
+    """
+    for a matrix of bits returns matrix of booleans, True where clause is satisfied by individual
+    """
+    literals_true = matrix[:, compiled['indices']] == compiled['polarities']
+    if compiled['width'] is not None:
+        return literals_true.reshape(len(matrix), -1, compiled['width']).any(axis=2)
+    return np.logical_or.reduceat(literals_true, compiled['offsets'], axis=1)
+
+
+def evaluate_population(matrix, compiled, satisfied_clause_bonus, satisfied_formula_bonus):
+    """
+    calculates fitness function of all individuals in one pass
+    :param matrix: population as a matrix of bits
+    :param compiled: compiled instance
+    :param satisfied_clause_bonus: bonus for satisfied clause
+    :param satisfied_formula_bonus: bonus for satisfied formula
+    :return: a dictionary with arrays of weights sums, numbers of satisfied clauses and fitnesses
+    """
+    weights_sums = matrix @ compiled['weights']
+    satisfied = satisfied_clauses_matrix(matrix, compiled).sum(axis=1)
+    fitnesses = weights_sums + satisfied * satisfied_clause_bonus
+    fitnesses[satisfied == compiled['n_clauses']] += satisfied_formula_bonus
+    return {'weights_sums': weights_sums, 'satisfied': satisfied, 'fitnesses': fitnesses}
@@ -1,50 +1,427 @@
+import asyncio
 import random
 import copy
+import functools
+import checkpoint as checkpoint_module
+import time
+import fitness_cache as fitness_cache_module
+import fitness_engine
+import genome
+import incremental_fitness
+import local_search
+import preprocessing
+import population_buffer
+import profiling
+import statistics_collector
+import threading
+import numpy as np
 import matplotlib.pyplot as plt
 
+# default number of individuals in each tournament of selection, constant, so that selection costs O(population)
+TOURNAMENT_SIZE = 4
+# number of literals of population, which packed representation unpacks and evaluates at once
+EVALUATION_CHUNK_SIZE = 1 << 24
+# bit generator of each thread, reseeded from random generator of run by numpy_generator
+_numpy_streams = threading.local()
+
+
+def run_anytime_and_set_bonuses(instance, n_individuals, n_iterations, crossover_probability, mutation_probability,
+                                satisfied_clause_bonus, satisfied_formula_bonus, representation='list',
+                                crossover_type='one_point', stop_on_valid=False, target_weights_sum=None,
+                                stagnation_window=None, time_limit=None, n_elites=0, selection_type='tournament',
+                                tournament_size=None, profiler=None, statistics=None, migration=None,
+                                local_search_probability=0.0, local_search_flips=100, preprocess=False,
+                                fitness_cache=None, checkpoint=None, checkpoint_interval=100, resume=False,
+                                progress_interval=None, seed=None):
+    """
+    runs genetic algorithm with certain values of bonuses as generator of events, so that caller gets the best
+    solution so far at any time and can stop the run whenever it wants
+    :param representation: 'list' for individuals as lists of 0 and 1, 'incremental' for individuals carrying
+    number of satisfied literals in each clause, so that offspring are evaluated only on changed variables,
+    'packed' for individuals packed into bits of an integer, 'buffered' for population kept in two preallocated
+    matrices of 0 and 1, which selection, crossover and mutation update in place
+    :param crossover_type: 'one_point' or 'uniform'
+    :param stop_on_valid: stop as soon as population contains valid individual
+    :param target_weights_sum: stop as soon as population contains valid individual with at least this sum of weights
+    :param stagnation_window: stop when the best fitness did not improve for this number of generations
+    :param time_limit: stop when running longer than this number of seconds
+    :param n_elites: number of individuals with the highest fitness carried unchanged into the next generation
+    :param selection_type: 'tournament', 'roulette' or 'universal' (roulette with stochastic universal sampling)
+    :param tournament_size: number of individuals in each tournament of selection, TOURNAMENT_SIZE if None
+    :param profiler: profiler collecting time of phases of each generation (see profiling), None to disable it
+    :param statistics: collector of statistics of each generation (see statistics_collector), None to disable it
+    :param migration: a dictionary with 'interval' (number of generations between migrations), 'n_migrants'
+    and 'exchange', function, which gets the best individuals (as lists of 0 and 1) and returns immigrants replacing
+    the worst ones, or None to stop the run (see island_model). None for no migration.
+    :param local_search_probability: probability, that offspring is improved by WalkSAT local search
+    :param local_search_flips: the highest number of flips of each local search
+    :param preprocess: run on instance simplified by unit propagation and elimination of pure literals
+    (see preprocessing), solution is mapped back to all variables
+    :param fitness_cache: cache of fitness of individuals (see fitness_cache), so that duplicate individuals
+    are evaluated only once (statistics then do not record diversity), None to disable it
+    :param checkpoint: file (.npz), to which population, progress and random state are saved, None to disable it
+    :param checkpoint_interval: number of generations between checkpoints
+    :param resume: continue from checkpoint, if it exists, exactly as the interrupted run would continue.
+    Other parameters must be the same as in the interrupted run.
+    :param progress_interval: number of generations between progress events, None for no progress events
+    :param seed: seed of random generator of the run (random.Random saved in checkpoints), so that the run
+    is reproducible. All random numbers, including those of numpy generators, come from it. Seeded from random
+    module if None, whose state is not changed otherwise.
+    :return: generator of events (dictionaries with 'type'): 'solution' with each new best valid individual,
+    its weights sum and generation, 'progress' with generation, the best fitness and number of satisfied clauses
+    in population and time of run, and the last one 'finished' with the best 'solution' (None if no solution found)
+    and generation, at which algorithm stopped
+    """
+    rng = random.Random(random.getrandbits(64) if seed is None else seed)
+    if preprocess:
+        preprocessed = preprocessing.preprocess(instance)
+        if preprocessed is None:
+            yield {'type': 'finished', 'solution': None, 'generation': 0}
+            return
+        instance, fixed_weights_sum = preprocessed['instance'], preprocessed['fixed_weights_sum']
+        if instance['n_clauses'] == 0:
+            solution = {'individual': preprocessing.restore(preprocessed, []), 'weights_sum': fixed_weights_sum,
+                        'generation': 0}
+            yield dict(solution, type='solution')
+            yield {'type': 'finished', 'solution': solution, 'generation': 0}
+            return
+        if target_weights_sum is not None:
+            target_weights_sum -= fixed_weights_sum
+
+    def solution_of(archive, generation):
+        if archive is None:
+            return None
+        if preprocess:
+            return {'individual': preprocessing.restore(preprocessed, archive['individual']),
+                    'weights_sum': archive['weights_sum'] + fixed_weights_sum, 'generation': generation}
+        return {'individual': archive['individual'], 'weights_sum': archive['weights_sum'], 'generation': generation}
 
-def run_and_set_bonuses(instance, n_individuals, n_iterations, crossover_probability, mutation_probability, satisfied_clause_bonus, satisfied_formula_bonus):
+    n_var, n_clauses, clauses, weights = instance['n_var'], instance['n_clauses'], instance['clauses'], instance[
+        'weights']
+    operators = get_operators(instance, representation, crossover_type, rng)
+    if fitness_cache is not None:
+        operators['evaluate'] = fitness_cache_module.cached_evaluate(fitness_cache, instance, operators['evaluate'],
+                                                                     operators['key'])
+    if selection_type not in ['tournament', 'roulette', 'universal']:
+        raise ValueError('Unknown selection type: ' + str(selection_type))
+    started = time.perf_counter()
+    best_fitness, stagnation, archive = None, 0, None
+    if local_search_probability > 0:
+        prepared = local_search.prepare(instance)
+
+    resumed = checkpoint_module.load_checkpoint(checkpoint) if checkpoint is not None and resume else None
+    if resumed is None:
+        population = operators['inicialize'](n_individuals, n_var)
+        iteration = 0
+    else:
+        individuals, state = resumed
+        if len(individuals) != n_individuals or state['n_var'] != n_var:
+            raise ValueError('Checkpoint ' + str(checkpoint) + ' belongs to other run')
+        population = operators['encode_population'](individuals)
+        iteration, archive = state['generation'], state['archive']
+        best_fitness, stagnation = state['best_fitness'], state['stagnation']
+        started -= state['seconds']
+        rng.setstate(checkpoint_module.random_state_from_json(state['random_state']))
+    while True:
+        if checkpoint is not None and iteration > 0 and iteration % checkpoint_interval == 0:
+            checkpoint_module.save_checkpoint(checkpoint, [operators['decode'](individual) for individual in population],
+                                              {'generation': iteration, 'n_var': n_var, 'archive': archive,
+                                               'best_fitness': None if best_fitness is None else int(best_fitness),
+                                               'stagnation': stagnation, 'seconds': time.perf_counter() - started,
+                                               'random_state': checkpoint_module.random_state_to_json(
+                                                   rng.getstate())})
+        if profiler is not None:
+            lap_started = time.perf_counter()
+        evaluation = operators['evaluate'](population, satisfied_clause_bonus, satisfied_formula_bonus)
+        if migration is not None and iteration > 0 and iteration % migration['interval'] == 0:
+            migrated = migrate(population, evaluation, migration, operators)
+            if migrated is None:
+                archive = update_archive(archive, population, evaluation, n_clauses, operators['decode'])
+                break
+            population = migrated
+            evaluation = operators['evaluate'](population, satisfied_clause_bonus, satisfied_formula_bonus)
+        updated_archive = update_archive(archive, population, evaluation, n_clauses, operators['decode'])
+        if statistics is not None:
+            statistics_collector.record(statistics, iteration, evaluation, n_clauses)
+        if profiler is not None:
+            profiling.lap(profiler, 'evaluation', lap_started, len(population))
+
+        if updated_archive is not archive:
+            archive = updated_archive
+            yield dict(solution_of(archive, iteration), type='solution')
+        if progress_interval is not None and iteration % progress_interval == 0:
+            yield {'type': 'progress', 'generation': iteration, 'best_fitness': int(evaluation['fitnesses'].max()),
+                   'satisfied': int(evaluation['satisfied'].max()), 'seconds': time.perf_counter() - started}
+        if profiler is not None:
+            # time spent by caller between events does not belong to any phase
+            lap_started = time.perf_counter()
+
+        if iteration >= n_iterations:
+            break
+        if archive is not None and (stop_on_valid or (target_weights_sum is not None and
+                                                      archive['weights_sum'] >= target_weights_sum)):
+            break
+        if stagnation_window is not None:
+            generation_best = evaluation['fitnesses'].max()
+            if best_fitness is None or generation_best > best_fitness:
+                best_fitness, stagnation = generation_best, 0
+            else:
+                stagnation += 1
+                if stagnation >= stagnation_window:
+                    break
+        if time_limit is not None and time.perf_counter() - started >= time_limit:
+            break
+
+        elites = [population[index] for index in evaluation['fitnesses'].argsort()[::-1][:n_elites]]
+        scaled = linear_scaling(population, weights, clauses, n_clauses, satisfied_clause_bonus,
+                                satisfied_formula_bonus, fitnesses=evaluation['fitnesses'])
+        if selection_type == 'tournament':
+            selected = tournament_indices(scaled, tournament_size, rng)
+        else:
+            selected = roulette_indices(scaled, universal=selection_type == 'universal', rng=rng)
+        population = operators['gather'](population, selected)
+        if profiler is not None:
+            lap_started = profiling.lap(profiler, 'selection', lap_started)
+        population = operators['crossover_population'](population, crossover_probability)
+        if profiler is not None:
+            lap_started = profiling.lap(profiler, 'crossover', lap_started)
+        population = operators['mutation_population'](population, mutation_probability)
+        if profiler is not None:
+            lap_started = profiling.lap(profiler, 'mutation', lap_started)
+        if local_search_probability > 0:
+            population = local_search_population(population, local_search_probability, operators,
+                                                 lambda individual: local_search.walksat(
+                                                     individual, prepared, local_search_flips,
+                                                     satisfied_clause_bonus, rng=rng), rng)
+            if profiler is not None:
+                profiling.lap(profiler, 'local_search', lap_started)
+        if elites:
+            population[:len(elites)] = elites
+        if profiler is not None:
+            profiling.end_generation(profiler, iteration)
+        iteration += 1
+
+    yield {'type': 'finished', 'solution': solution_of(archive, iteration), 'generation': iteration}
+
+
+def run_and_set_bonuses(instance, n_individuals, n_iterations, crossover_probability, mutation_probability,
+                        satisfied_clause_bonus, satisfied_formula_bonus, **options):
     """
     runs genetic algorithm with certain values of bonuses
-    :return: solution. None if no solution found.
+    :param options: optional settings, see run_anytime_and_set_bonuses
+    :return: the best valid individual found during the run, with generation, at which algorithm stopped.
+    None if no solution found.
     """
-    n_var, n_clauses, clauses, weights = instance['n_var'], instance['n_clauses'], instance['clauses'], instance[
-        'weights']
+    for event in run_anytime_and_set_bonuses(instance, n_individuals, n_iterations, crossover_probability,
+                                             mutation_probability, satisfied_clause_bonus, satisfied_formula_bonus,
+                                             **options):
+        if event['type'] == 'finished':
+            return event['solution']
 
-    population = inicialize_population(n_individuals=n_individuals, individual_size=n_var)
-    for iteration in range(n_iterations):
-        population = selection_by_tournament(population, weights, clauses, n_clauses, satisfied_clause_bonus, satisfied_formula_bonus)
-        population = crossover_population(population, crossover_probability)
-        population = mutation_population(population, mutation_probability)
 
-    solution = get_best_individual(population, weights, clauses)
-    return solution
-
-
-def run(instance, n_individuals, n_iterations, crossover_probability, mutation_probability):
+def run(instance, n_individuals, n_iterations, crossover_probability, mutation_probability, **options):
     """
     runs genetic algorithm for input instance of problem
+    :param options: optional settings passed to run_and_set_bonuses
     :return: solution. None if no solution found.
     """
-    n_var, n_clauses, clauses, weights = instance['n_var'], instance['n_clauses'], instance['clauses'], instance['weights']
     satisfied_clause_bonus, satisfied_formula_bonus = 500, 1100
+    return run_and_set_bonuses(instance, n_individuals, n_iterations, crossover_probability, mutation_probability,
+                               satisfied_clause_bonus, satisfied_formula_bonus, **options)
+
+
+def run_anytime(instance, n_individuals, n_iterations, crossover_probability, mutation_probability, **options):
+    """
+    runs genetic algorithm for input instance of problem as generator of events
+    :param options: optional settings passed to run_anytime_and_set_bonuses
+    :return: generator of events, see run_anytime_and_set_bonuses
+    """
+    satisfied_clause_bonus, satisfied_formula_bonus = 500, 1100
+    return run_anytime_and_set_bonuses(instance, n_individuals, n_iterations, crossover_probability,
+                                       mutation_probability, satisfied_clause_bonus, satisfied_formula_bonus,
+                                       **options)
 
-    population = inicialize_population(n_individuals=n_individuals, individual_size=n_var)
-    # statistics = [get_statistics(population, weights, clauses, n_clauses)]
-    for iteration in range(n_iterations):
-        population = selection_by_tournament(population, weights, clauses, n_clauses, satisfied_clause_bonus, satisfied_formula_bonus)
-        population = crossover_population(population, crossover_probability)
-        population = mutation_population(population, mutation_probability)
 
-        # optional for investigation
-        # current_statistics = get_statistics(population, weights, clauses, n_clauses)
-        # statistics.append(current_statistics)
+async def run_async(instance, n_individuals, n_iterations, crossover_probability, mutation_probability, **options):
+    """
+    runs genetic algorithm for input instance of problem as asynchronous iterator of events. Generations run
+    in a thread, so that event loop is not blocked.
+    :param options: optional settings passed to run_anytime_and_set_bonuses
+    :return: asynchronous generator of events, see run_anytime_and_set_bonuses
+    """
+    events = run_anytime(instance, n_individuals, n_iterations, crossover_probability, mutation_probability,
+                         **options)
+    loop = asyncio.get_running_loop()
+    while True:
+        event = await loop.run_in_executor(None, next, events, None)
+        if event is None:
+            return
+        yield event
+
+
+def get_operators(instance, representation, crossover_type='one_point', rng=random):
+    """
+    returns functions for inicialization, evaluation and variation of population for given representation of individuals
+    and for conversion of individuals from and to lists of 0 and 1, key is hashable genome of individual
+    :param instance: a dictionary, which represents an instance of problem
+    :param representation: 'list', 'incremental', 'packed' or 'buffered'
+    :param crossover_type: 'one_point' or 'uniform'
+    :param rng: random generator of run (random.Random), which all operators draw from, random module if not given
+    :return: a dictionary of functions
+    """
+    n_var, n_clauses, clauses, weights = instance['n_var'], instance['n_clauses'], instance['clauses'], instance[
+        'weights']
+    if crossover_type not in ['one_point', 'uniform']:
+        raise ValueError('Unknown crossover type: ' + str(crossover_type))
+
+    if representation == 'list':
+        compiled = fitness_engine.get_compiled(instance)
+
+        def evaluate(population, satisfied_clause_bonus, satisfied_formula_bonus):
+            matrix = fitness_engine.population_matrix(population)
+            evaluation = fitness_engine.evaluate_population(matrix, compiled, satisfied_clause_bonus,
+                                                            satisfied_formula_bonus)
+            evaluation['matrix'] = matrix
+            return evaluation
+
+        crossover = crossover_pair if crossover_type == 'one_point' else uniform_crossover_pair
+        return population_operators({'inicialize': functools.partial(inicialize_population, rng=rng),
+                                     'evaluate': evaluate, 'crossover': functools.partial(crossover, rng=rng),
+                                     'mutation': functools.partial(mutation_individual, rng=rng),
+                                     'decode': lambda individual: individual,
+                                     'encode': lambda individual: list(individual), 'key': bytes}, rng)
+
+    if representation == 'packed':
+        compiled = fitness_engine.get_compiled(instance)
+        crossover = genome.crossover_pair if crossover_type == 'one_point' else genome.uniform_crossover_pair
+
+        chunk_size = max(1, EVALUATION_CHUNK_SIZE // max(1, len(compiled['indices'])))
+
+        def evaluate(population, satisfied_clause_bonus, satisfied_formula_bonus):
+            # population is unpacked by chunks of rows, so that dense matrix of whole population never exists
+            chunks, ones = [], np.zeros(n_var)
+            for start in range(0, len(population), chunk_size):
+                matrix = genome.unpack_population(population[start:start + chunk_size], n_var)
+                chunks.append(fitness_engine.evaluate_population(matrix, compiled, satisfied_clause_bonus,
+                                                                 satisfied_formula_bonus))
+                ones += matrix.sum(axis=0)
+            evaluation = {name: np.concatenate([chunk[name] for chunk in chunks]) for name in chunks[0]}
+            evaluation['ones'] = ones / len(population)
+            return evaluation
+
+        return population_operators({'inicialize': functools.partial(genome.inicialize_population, rng=rng),
+                                     'evaluate': evaluate,
+                                     'crossover': lambda genome1, genome2: crossover(genome1, genome2, n_var, rng),
+                                     'mutation': lambda packed: genome.mutation_individual(packed, n_var, rng),
+                                     'decode': lambda packed: genome.unpack(packed, n_var), 'encode': genome.pack,
+                                     'key': lambda packed: packed}, rng)
+
+    if representation == 'incremental':
+        if crossover_type != 'one_point':
+            raise ValueError('Incremental representation supports only one point crossover')
+        occurrences = incremental_fitness.build_occurrences(instance)
+
+        def inicialize(n_individuals, individual_size):
+            return [incremental_fitness.create_state(individual, clauses, weights) for individual in
+                    inicialize_population(n_individuals, individual_size, rng)]
+
+        def evaluate(population, satisfied_clause_bonus, satisfied_formula_bonus):
+            return incremental_fitness.evaluate_states(population, n_clauses, satisfied_clause_bonus,
+                                                       satisfied_formula_bonus)
+
+        return population_operators({
+            'inicialize': inicialize, 'evaluate': evaluate,
+            'crossover': lambda state1, state2: incremental_fitness.crossover_pair(state1, state2, occurrences,
+                                                                                   weights, rng),
+            'mutation': lambda state: incremental_fitness.mutation_individual(state, occurrences, weights, rng),
+            'decode': lambda state: state['individual'],
+            'encode': lambda individual: incremental_fitness.create_state(list(individual), clauses, weights),
+            'key': lambda state: bytes(state['individual'])}, rng)
+
+    if representation == 'buffered':
+        compiled = fitness_engine.get_compiled(instance)
+        buffers = {}
+
+        def inicialize(n_individuals, individual_size):
+            buffers.update(population_buffer.create_buffers(n_individuals, individual_size))
+            return numpy_generator(rng).integers(0, 2, size=(n_individuals, individual_size), dtype=np.uint8)
+
+        def encode_population(individuals):
+            buffers.update(population_buffer.create_buffers(len(individuals), n_var))
+            return np.asarray(individuals, dtype=np.uint8).reshape(len(individuals), n_var)
+
+        def evaluate(population, satisfied_clause_bonus, satisfied_formula_bonus):
+            # population is matrix, only fitness cache passes list of its rows
+            matrix = np.asarray(population, dtype=np.uint8)
+            evaluation = fitness_engine.evaluate_population(matrix, compiled, satisfied_clause_bonus,
+                                                            satisfied_formula_bonus)
+            evaluation['matrix'] = matrix
+            return evaluation
+
+        return {'inicialize': inicialize, 'evaluate': evaluate, 'decode': lambda row: row.tolist(),
+                'encode': lambda individual: np.asarray(individual, dtype=np.uint8),
+                'key': lambda row: row.tobytes(), 'encode_population': encode_population,
+                'gather': lambda population, selected: population_buffer.gather(buffers, population, selected),
+                'crossover_population': lambda population, probability: population_buffer.crossover_population(
+                    buffers, population, probability, numpy_generator(rng), uniform=crossover_type == 'uniform'),
+                'mutation_population': lambda population, probability: population_buffer.mutation_population(
+                    population, probability, numpy_generator(rng))}
+
+    raise ValueError('Unknown representation of individuals: ' + str(representation))
+
+
+def migrate(population, evaluation, migration, operators):
+    """
+    sends the best individuals of population away and replaces the worst ones with received immigrants
+    :param population: population
+    :param evaluation: evaluation of population
+    :param migration: a dictionary with number of migrants and function exchanging them
+    :param operators: functions of representation of individuals
+    :return: new population. None if the run should stop.
+    """
+    order = evaluation['fitnesses'].argsort()
+    emigrants = [list(operators['decode'](population[index])) for index in order[::-1][:migration['n_migrants']]]
+    immigrants = migration['exchange'](emigrants)
+    if immigrants is None:
+        return None
+    population = population.copy()
+    for index, immigrant in zip(order, immigrants):
+        population[index] = operators['encode'](immigrant)
+    return population
+
+
+def population_operators(operators, rng=random):
+    """
+    adds operators working on whole population of individuals kept in list to operators of representation
+    :param rng: random generator of run (random.Random), random module if not given
+    :return: a dictionary of functions
+    """
+    operators['encode_population'] = lambda individuals: [operators['encode'](individual) for individual in individuals]
+    operators['gather'] = lambda population, selected: [population[index] for index in selected]
+    operators['crossover_population'] = lambda population, probability: crossover_population(
+        population, probability, operators['crossover'], rng)
+    operators['mutation_population'] = lambda population, probability: mutation_population(
+        population, probability, operators['mutation'], rng)
+    return operators
 
-    # optional
-    # plot_statistics(statistics)
 
-    solution = get_best_individual(population, weights, clauses)
-    return solution
+def update_archive(archive, population, evaluation, n_clauses, decode):
+    """
+    returns the best valid individual seen so far, updated with just evaluated population
+    :param archive: the best valid individual seen so far, None if there was none
+    :param population: population
+    :param evaluation: evaluation of population (weights sums and numbers of satisfied clauses)
+    :param n_clauses: number of clauses
+    :param decode: function, which returns individual as list of 0 and 1
+    :return: a dictionary with individual and its sum of weights, None if no valid individual was seen
+    """
+    valid = np.flatnonzero(evaluation['satisfied'] == n_clauses)
+    if len(valid) == 0:
+        return archive
+    best = valid[evaluation['weights_sums'][valid].argmax()]
+    if archive is not None and evaluation['weights_sums'][best] <= archive['weights_sum']:
+        return archive
+    return {'individual': list(decode(population[best])), 'weights_sum': int(evaluation['weights_sums'][best])}
 
 
 def get_statistics(population, weights, clauses, n_clauses, satisfied_clause_bonus, satisfied_formula_bonus):
@@ -57,22 +434,23 @@ def get_statistics(population, weights, clauses, n_clauses, satisfied_clause_bon
 
 def plot_statistics(statistics):
     """
-    plots input statistics
+    plots input statistics, all generations at once
+    :param statistics: collector from statistics_collector or list of results of get_statistics
     """
+    if isinstance(statistics, dict):
+        count = statistics['count']
+        values_max, values_min, values_avg = [statistics[name][:count] for name in ['max', 'min', 'avg']]
+    else:
+        values_max, values_min, values_avg = [np.array([x[name] for x in statistics]) for name in ['max', 'min', 'avg']]
 
-    values_max = [x['max'] for x in statistics]
-    values_min = [x['min'] for x in statistics]
-
-    maximum = max(values_max)
-    minimum = min(values_min)
+    maximum = values_max.max()
+    minimum = values_min.min()
     step = (maximum-minimum)/5
 
-    counter = 0
-    for item in statistics:
-        plt.scatter(counter, item['max'], color='green', s=2)
-        plt.scatter(counter, item['min'], color='red', s=2)
-        plt.scatter(counter, item['avg'], color='yellow', s=2)
-        counter += 1
+    generations = np.arange(len(values_max))
+    plt.scatter(generations, values_max, color='green', s=2)
+    plt.scatter(generations, values_min, color='red', s=2)
+    plt.scatter(generations, values_avg, color='yellow', s=2)
 
     plt.ylim(minimum-step, maximum+step)
 
@@ -81,10 +459,16 @@ def plot_statistics(statistics):
     plt.show()
 
 
-def get_weights_sum(individual, weights):
+def get_weights_sum(individual, weights, planes=None):
     """
     return sum of weights of variables set to True for input individual
+    :param planes: bit planes of weights (see genome.weight_planes) for packed individual, built from weights if None
     """
+    if isinstance(individual, int):
+        if planes is None:
+            planes = genome.weight_planes(weights)
+        return genome.weights_sum(individual, planes)
+
     index, fitness = 0, 0
 
     for i in individual:
@@ -126,7 +510,9 @@ def get_best_individual(population, weights, clauses):
             valid_individuals.append(individual)
     if len(valid_individuals) == 0:
         return None
-    weights_sums = [get_weights_sum(valid_individual, weights) for valid_individual in valid_individuals]
+    # bit planes of weights are built once for all packed individuals
+    planes = genome.weight_planes(weights) if isinstance(valid_individuals[0], int) else None
+    weights_sums = [get_weights_sum(valid_individual, weights, planes) for valid_individual in valid_individuals]
     best_sum = max(weights_sums)
     index = weights_sums.index(best_sum)
     best_individual = valid_individuals[index]
@@ -140,62 +526,75 @@ def flip(n):
         return 0
 
 
-def mutation_individual(individual):
+def mutation_individual(individual, rng=random):
     """
     returns mutated individual
+    :param rng: random generator of run (random.Random), random module if not given
     """
-    index = random.randint(0, len(individual) - 1)
+    index = rng.randint(0, len(individual) - 1)
     individual_new = copy.deepcopy(individual)
     individual_new[index] = flip(individual_new[index])
     return individual_new
 
 
-def mutation_population(population, probability):
+def mutation_population(population, probability, mutation=mutation_individual, rng=random):
     """
     returns population with performed mutation
+    :param mutation: function, which returns mutated individual
+    :param rng: random generator of run (random.Random), random module if not given
+    """
+    # decisions for whole population are drawn in one block
+    for index in np.flatnonzero(numpy_generator(rng).random(len(population)) < probability).tolist():
+        population[index] = mutation(population[index])
+    return population
+
+
+def local_search_population(population, probability, operators, search, rng=random):
     """
-    for index in range(len(population)):
-        number = random.random()
-        if number < probability:
-            population[index] = mutation_individual(population[index])
+    returns population, in which individuals are improved by local search with given probability
+    :param operators: functions of representation of individuals
+    :param search: function, which returns improved individual (list of 0 and 1)
+    :param rng: random generator of run (random.Random), random module if not given
+    """
+    for index in np.flatnonzero(numpy_generator(rng).random(len(population)) < probability).tolist():
+        population[index] = operators['encode'](search(operators['decode'](population[index])))
     return population
 
 
-def uniform_crossover_pair(individual1, individual2):
+def uniform_crossover_pair(individual1, individual2, rng=random):
     """
     for 2 input individuals performs uniform crossover and returns new pair
     """
-    individual1_new, individual2_new = [], []
-    for i in range(len(individual1)):
-        check = random.randint(0,1)
-        if check == 1:
-            individual1_new.append(individual2[i])
-            individual2_new.append(individual1[i])
-        else:
-            individual1_new.append(individual1[i])
-            individual2_new.append(individual2[i])
+    # one random bit per variable, all drawn at once
+    mask = rng.getrandbits(len(individual1))
+    swapped = [(mask >> i) & 1 for i in range(len(individual1))]
+    individual1_new = [value2 if swap else value1 for value1, value2, swap in zip(individual1, individual2, swapped)]
+    individual2_new = [value1 if swap else value2 for value1, value2, swap in zip(individual1, individual2, swapped)]
     return [individual1_new, individual2_new]
 
 
-def crossover_pair(individual1, individual2):
+def crossover_pair(individual1, individual2, rng=random):
     """
     for 2 input individuals performs one point crossover and returns new pair
     """
-    point = random.randint(0,len(individual1)-1)
+    point = rng.randint(0,len(individual1)-1)
     individual1_new = individual1[:point] + individual2[point:]
     individual2_new = individual2[:point] + individual1[point:]
     return [individual1_new, individual2_new]
 
 
-def crossover_population(population, probability):
+def crossover_population(population, probability, crossover=crossover_pair, rng=random):
     """
     returns population with performed crossover
+    :param crossover: function, which for 2 individuals returns new pair
+    :param rng: random generator of run (random.Random), random module if not given
     """
     population_new = []
+    # decisions for all pairs are drawn in one block
+    crossed = (numpy_generator(rng).random(int(len(population)/2)) < probability).tolist()
     for i in range(int(len(population)/2)):
-        number = random.random()
-        if number < probability:
-            population_new.extend(crossover_pair(population[2*i], population[2*i+1]))
+        if crossed[i]:
+            population_new.extend(crossover(population[2*i], population[2*i+1]))
         else:
             population_new.extend([population[2*i], population[2*i + 1]])
     if len(population_new) < len(population):
@@ -203,69 +602,101 @@ def crossover_population(population, probability):
     return population_new
 
 
-def selection(population, weights, clauses, n_clauses, satisfied_clause_bonus, satisfied_formula_bonus):
+def selection(population, weights, clauses, n_clauses, satisfied_clause_bonus, satisfied_formula_bonus, fitnesses=None,
+              universal=False):
     """
     returns new selected population, using roulette selection and linear scaling
+    :param universal: use stochastic universal sampling (equally spaced pointers) instead of independent spins
     """
 
     # calculating fitness function for each individual, now with linear scaling
-    fitnesses = linear_scaling(population, weights, clauses, n_clauses, satisfied_clause_bonus, satisfied_formula_bonus)
+    fitnesses = linear_scaling(population, weights, clauses, n_clauses, satisfied_clause_bonus, satisfied_formula_bonus,
+                               fitnesses)
 
-    # generating roulette based on fitness values
-    roulette, index = [], 0
-    for f in fitnesses:
-        for i in range(f):
-            roulette.append(index)
-        index += 1
+    return [population[index] for index in roulette_indices(fitnesses, universal)]
 
-    # selecting individuals
-    population_new = []
-    for i in range(len(population)):
-        value = random.randint(0, len(roulette) - 1)
-        number_of_individual = roulette[value]
-        individual = population[number_of_individual]
-        population_new.append(individual)
 
-    return population_new
+def roulette_indices(fitnesses, universal=False, rng=random):
+    """
+    returns indices of individuals selected by roulette
+    :param fitnesses: linearly scaled fitness function values of population
+    :param universal: use stochastic universal sampling (equally spaced pointers) instead of independent spins
+    :param rng: random generator of run (random.Random), random module if not given
+    """
+    # roulette is cumulative sum of fitness values, individual i owns interval [cumulative[i-1], cumulative[i])
+    cumulative = np.cumsum(fitnesses)
+    generator = numpy_generator(rng)
+    if universal:
+        step = cumulative[-1] / len(fitnesses)
+        pointers = generator.uniform(0, step) + step * np.arange(len(fitnesses))
+    else:
+        pointers = generator.integers(0, cumulative[-1], size=len(fitnesses))
+
+    # selecting individuals, universal sampling selects them ordered, so they are shuffled before pairing
+    selected = np.searchsorted(cumulative, pointers, side='right')
+    if universal:
+        generator.shuffle(selected)
+    return selected
 
 
-def selection_by_tournament(population, weights, clauses, n_clauses, satisfied_clause_bonus, satisfied_formula_bonus):
+def selection_by_tournament(population, weights, clauses, n_clauses, satisfied_clause_bonus, satisfied_formula_bonus, fitnesses=None,
+                            tournament_size=None):
     """
     returns new selected population, using tournament selection and linear scaling
+    :param tournament_size: number of individuals in each tournament, TOURNAMENT_SIZE if None
     """
 
     # calculating fitness function for each individual, now with linear scaling
-    fitnesses = linear_scaling(population, weights, clauses, n_clauses, satisfied_clause_bonus, satisfied_formula_bonus)
+    fitnesses = linear_scaling(population, weights, clauses, n_clauses, satisfied_clause_bonus,
+                               satisfied_formula_bonus, fitnesses)
+    return [population[index] for index in tournament_indices(fitnesses, tournament_size)]
 
-    # selecting individuals
-    population_new = []
-    for i in range(len(population)):
-        tournament = []
-        for j in range(int(len(population)/5)):
-            index = random.randint(0, len(population) - 1)
-            tournament.append(index)
-        max_fitness = max([fitnesses[index] for index in tournament])
-        best_index = fitnesses.index(max_fitness)
-        population_new.append(population[best_index])
 
-    return population_new
+def tournament_indices(fitnesses, tournament_size=None, rng=random):
+    """
+    returns indices of winners of tournaments
+    :param fitnesses: linearly scaled fitness function values of population
+    :param tournament_size: number of individuals in each tournament, TOURNAMENT_SIZE if None
+    :param rng: random generator of run (random.Random), random module if not given
+    """
+    fitnesses = np.asarray(fitnesses)
+    if tournament_size is None:
+        tournament_size = TOURNAMENT_SIZE
+
+    # all tournaments of generation are drawn at once, winner is the first one with the highest fitness
+    tournaments = numpy_generator(rng).integers(0, len(fitnesses), size=(len(fitnesses), max(1, tournament_size)))
+    return tournaments[np.arange(len(fitnesses)), fitnesses[tournaments].argmax(axis=1)]
 
 
-def linear_scaling(population, weights, clauses, n_clauses, satisfied_clause_bonus, satisfied_formula_bonus):
+def numpy_generator(rng=random):
+    """
+    returns numpy random generator seeded from random generator of run, so that its seed makes whole run reproducible.
+    Generator of thread is reused and its state is set directly (without hashing of seed), so it is valid
+    only until the next call in the same thread.
+    :param rng: random generator of run (random.Random), random module if not given
+    """
+    if not hasattr(_numpy_streams, 'generator'):
+        _numpy_streams.generator = np.random.Generator(np.random.PCG64())
+    _numpy_streams.generator.bit_generator.state = {
+        'bit_generator': 'PCG64', 'state': {'state': rng.getrandbits(128), 'inc': rng.getrandbits(128) | 1},
+        'has_uint32': 0, 'uinteger': 0}
+    return _numpy_streams.generator
+
+
+def linear_scaling(population, weights, clauses, n_clauses, satisfied_clause_bonus, satisfied_formula_bonus, fitnesses=None):
     """
     for given population returns list of fitness function values, linearly scaled
+    :param fitnesses: already calculated fitness function values of population. Calculated here if None.
     """
-    fitnesses = [fitness(individual, weights, clauses, n_clauses, satisfied_clause_bonus, satisfied_formula_bonus) for
-                 individual in population]
+    if fitnesses is None:
+        fitnesses = [fitness(individual, weights, clauses, n_clauses, satisfied_clause_bonus, satisfied_formula_bonus)
+                     for individual in population]
     z_max, z_min = max(fitnesses), min(fitnesses)
     if z_min == z_max:
         return [1 for x in range(len(population))]
     z1, z2 = 100, 200
-    fitnesses_new = []
-    for z in fitnesses:
-        z_new = int(z1 + (z - z_min)*(z2 - z1)/(z_max - z_min))
-        fitnesses_new.append(z_new)
-    return fitnesses_new
+    fitnesses_new = z1 + (np.asarray(fitnesses) - z_min)*(z2 - z1)/(z_max - z_min)
+    return fitnesses_new.astype(int).tolist()
 
 
 def fitness(individual, weights, clauses, n_clauses, satisfied_clause_bonus, satisfied_formula_bonus):
@@ -301,17 +732,12 @@ def fitness(individual, weights, clauses, n_clauses, satisfied_clause_bonus, sat
     return fitness
 
 
-def inicialize_population(n_individuals, individual_size):
+def inicialize_population(n_individuals, individual_size, rng=random):
     """
     returns randomly filled n individuals
+    :param rng: random generator of run (random.Random), random module if not given
     """
-    population = []
-    while len(population) < n_individuals:
-        individual = []
-        for j in range(individual_size):
-            individual.append(random.getrandbits(1))
-        population.append(individual)
-    return population
+    return numpy_generator(rng).integers(0, 2, size=(n_individuals, individual_size), dtype=np.uint8).tolist()
 
 
 
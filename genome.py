@@ -0,0 +1,79 @@
+import random
+import numpy as np
+
+
+def pack(individual):
+    """
+    returns individual (list of 0 and 1) packed into bits of an integer, variable i is bit i
+    """
+    return int.from_bytes(np.packbits(np.asarray(individual, dtype=np.uint8), bitorder='little').tobytes(), 'little')
+
+
+def unpack(genome, individual_size):
+    """
+    returns packed genome as list of 0 and 1
+    """
+    return unpack_population([genome], individual_size)[0].tolist()
+
+
+def unpack_population(population, individual_size):
+    """
+    returns population of packed genomes as a matrix of bits, one row per individual
+    """
+    n_bytes = (individual_size + 7) // 8
+    data = b''.join(genome.to_bytes(n_bytes, 'little') for genome in population)
+    words = np.frombuffer(data, dtype=np.uint8).reshape(len(population), n_bytes)
+    return np.unpackbits(words, axis=1, count=individual_size, bitorder='little')
+
+
+def inicialize_population(n_individuals, individual_size, rng=random):
+    """
+    returns randomly filled n packed genomes
+    :param rng: random generator of run (random.Random), random module if not given
+    """
+    return [rng.getrandbits(individual_size) for i in range(n_individuals)]
+
+
+def mutation_individual(genome, individual_size, rng=random):
+    """
+    returns genome with one random bit flipped
+    """
+    return genome ^ (1 << rng.randint(0, individual_size - 1))
+
+
+def crossover_pair(genome1, genome2, individual_size, rng=random):
+    """
+    for 2 input genomes performs one point crossover with a bit mask and returns new pair
+    """
+    point = rng.randint(0, individual_size - 1)
+    head = (1 << point) - 1
+    return [(genome1 & head) | (genome2 & ~head), (genome2 & head) | (genome1 & ~head)]
+
+
+def uniform_crossover_pair(genome1, genome2, individual_size, rng=random):
+    """
+    for 2 input genomes performs uniform crossover with a random bit mask and returns new pair
+    """
+    swapped = (genome1 ^ genome2) & rng.getrandbits(individual_size)
+    return [genome1 ^ swapped, genome2 ^ swapped]
+
+
+def weight_planes(weights):
+    """
+    splits non-negative integer weights into bit planes: for each bit of weights a mask of variables, which have it set
+    :return: list of pairs (value of bit, mask)
+    """
+    planes = []
+    weights = np.asarray(weights, dtype=np.int64)
+    for bit in range(int(weights.max()).bit_length()):
+        mask = pack((weights >> bit) & 1)
+        if mask:
+            planes.append((1 << bit, mask))
+    return planes
+
+
+def weights_sum(genome, planes):
+    """
+    returns sum of weights of variables set to True, counted by popcount over weight planes
+    """
+    return sum(value * (genome & mask).bit_count() for value, mask in planes)
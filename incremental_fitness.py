@@ -0,0 +1,131 @@
+import random
+import numpy as np
+
+# changed counts of state are merged into new counts, when there are more of them than this share of clauses
+MERGE_RATIO = 0.125
+
+
+def build_occurrences(instance):
+    """
+    builds index of occurrences of variables in clauses
+    :param instance: a dictionary, which represents an instance of problem
+    :return: a dictionary with lists of clauses, where each variable is positive and where it is negated
+    """
+    positive = [[] for i in range(instance['n_var'])]
+    negative = [[] for i in range(instance['n_var'])]
+    for clause_index, clause in enumerate(instance['clauses']):
+        for var in clause:
+            if var > 0:
+                positive[var - 1].append(clause_index)
+            else:
+                negative[-var - 1].append(clause_index)
+    return {'positive': positive, 'negative': negative}
+
+
+def create_state(individual, clauses, weights):
+    """
+    returns state of individual: number of satisfied literals in each clause, number of satisfied clauses
+    and sum of weights of variables set to True. Counts are shared by copies of state, counts changed
+    by flips are kept in dictionary 'changed' of each copy.
+    """
+    counts = []
+    for clause in clauses:
+        count = 0
+        for var in clause:
+            if (var > 0 and individual[var - 1] == 1) or (var < 0 and individual[-var - 1] == 0):
+                count += 1
+        counts.append(count)
+    weights_sum = sum(weight for value, weight in zip(individual, weights) if value == 1)
+    return {'individual': individual, 'counts': counts, 'changed': {}, 'n_satisfied': len(counts) - counts.count(0),
+            'weights_sum': weights_sum}
+
+
+def copy_state(state):
+    """
+    returns independent copy of state, counts are shared and only changed counts are copied,
+    so that copy costs O(changed clauses) instead of O(clauses) until changes are merged
+    """
+    counts, changed = state['counts'], state['changed']
+    if len(changed) > MERGE_RATIO * len(counts):
+        counts = counts[:]
+        for clause_index, count in changed.items():
+            counts[clause_index] = count
+        changed = {}
+    else:
+        changed = dict(changed)
+    return {'individual': state['individual'][:], 'counts': counts, 'changed': changed,
+            'n_satisfied': state['n_satisfied'], 'weights_sum': state['weights_sum']}
+
+
+def flip_variable(state, index, occurrences, weights):
+    """
+    flips variable of individual in place and updates state in O(occurrences of the variable),
+    shared counts are not modified
+    """
+    individual, counts, changed = state['individual'], state['counts'], state['changed']
+    if individual[index] == 0:
+        gained, lost = occurrences['positive'][index], occurrences['negative'][index]
+        individual[index] = 1
+        state['weights_sum'] += weights[index]
+    else:
+        gained, lost = occurrences['negative'][index], occurrences['positive'][index]
+        individual[index] = 0
+        state['weights_sum'] -= weights[index]
+
+    n_satisfied = state['n_satisfied']
+    for clause_index in gained:
+        count = changed.get(clause_index, counts[clause_index])
+        if count == 0:
+            n_satisfied += 1
+        changed[clause_index] = count + 1
+    for clause_index in lost:
+        count = changed.get(clause_index, counts[clause_index]) - 1
+        if count == 0:
+            n_satisfied -= 1
+        changed[clause_index] = count
+    state['n_satisfied'] = n_satisfied
+
+
+def mutation_individual(state, occurrences, weights, rng=random):
+    """
+    returns mutated state, only clauses containing flipped variable are updated
+    :param rng: random generator of run (random.Random), random module if not given
+    """
+    index = rng.randint(0, len(state['individual']) - 1)
+    state_new = copy_state(state)
+    flip_variable(state_new, index, occurrences, weights)
+    return state_new
+
+
+def crossover_pair(state1, state2, occurrences, weights, rng=random):
+    """
+    for 2 input states performs one point crossover and returns new pair,
+    only variables of the shorter swapped segment, which differ in parents, are re-evaluated
+    """
+    individual1, individual2 = state1['individual'], state2['individual']
+    point = rng.randint(0, len(individual1) - 1)
+    if point < len(individual1) - point:
+        # children take the head of the other parent
+        state1_new, state2_new = copy_state(state2), copy_state(state1)
+        segment = range(point)
+    else:
+        # children keep their own head and take the tail of the other parent
+        state1_new, state2_new = copy_state(state1), copy_state(state2)
+        segment = range(point, len(individual1))
+    for index in segment:
+        if individual1[index] != individual2[index]:
+            flip_variable(state1_new, index, occurrences, weights)
+            flip_variable(state2_new, index, occurrences, weights)
+    return [state1_new, state2_new]
+
+
+def evaluate_states(states, n_clauses, satisfied_clause_bonus, satisfied_formula_bonus):
+    """
+    calculates fitness function of all states without looking at clauses
+    :return: a dictionary with arrays of weights sums, numbers of satisfied clauses and fitnesses
+    """
+    weights_sums = np.fromiter((state['weights_sum'] for state in states), dtype=np.int64, count=len(states))
+    satisfied = np.fromiter((state['n_satisfied'] for state in states), dtype=np.int64, count=len(states))
+    fitnesses = weights_sums + satisfied * satisfied_clause_bonus
+    fitnesses[satisfied == n_clauses] += satisfied_formula_bonus
+    return {'weights_sums': weights_sums, 'satisfied': satisfied, 'fitnesses': fitnesses}
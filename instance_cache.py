@@ -0,0 +1,133 @@
+import functools
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import numpy as np
+import dimacs
+import fitness_engine
+
+# arrays of compiled instance, which are saved to disk cache
+ARRAYS = ['literals', 'offsets', 'indices', 'polarities', 'weights', 'occurrence_offsets', 'occurrence_clauses']
+
+
+def parse_instance(content):
+    """
+    parses instance in format 'n_var n_clauses 0 clause 0 clause 0 ... % weights #' into flat arrays
+    :param content: content of file
+    :return: compiled instance
+    """
+    body, weights_str = content.split('%', 1)
+    tokens = np.array(body.split(), dtype=np.int64)
+    n_var, n_clauses = int(tokens[0]), int(tokens[1])
+
+    # first zero ends numbers of variables and clauses, each following zero ends a clause
+    ends = np.flatnonzero(tokens == 0)
+    literals = tokens[ends[0] + 1:ends[-1]]
+    literals = literals[literals != 0]
+    lengths = np.diff(ends) - 1
+    offsets = np.zeros(len(lengths), dtype=np.int64)
+    np.cumsum(lengths[:-1], out=offsets[1:])
+    weights = [int(x) for x in weights_str.replace('#', '').split()]
+    return fitness_engine.compile_arrays(n_var, n_clauses, literals, offsets, weights)
+
+
+def to_instance(compiled):
+    """
+    returns instance accepted by GA, which carries its compiled form
+    """
+    literals = compiled['literals']
+    if compiled['width'] is not None:
+        clauses = literals.reshape(-1, compiled['width']).tolist()
+    else:
+        clauses = [clause.tolist() for clause in np.split(literals, compiled['offsets'][1:])]
+    return {'n_var': compiled['n_var'], 'n_clauses': compiled['n_clauses'], 'clauses': clauses,
+            'weights': compiled['weights'].tolist(), 'compiled': compiled}
+
+
+def save_compiled(compiled, folder):
+    """
+    saves arrays of compiled instance to folder, one .npy file per array. Files are written into temporary folder,
+    which is then renamed to folder, so that other processes never see it unfinished. If other process saved
+    the same instance first, its folder is kept.
+    """
+    parent = os.path.dirname(os.path.abspath(folder))
+    os.makedirs(parent, exist_ok=True)
+    temporary = tempfile.mkdtemp(prefix=os.path.basename(folder) + '.', suffix='.tmp', dir=parent)
+    try:
+        for name in ARRAYS:
+            np.save(os.path.join(temporary, name + '.npy'), compiled[name])
+        header = {'n_var': compiled['n_var'], 'n_clauses': compiled['n_clauses'], 'width': compiled['width']}
+        with open(os.path.join(temporary, 'header.json'), mode='w', encoding='utf-8') as a_file:
+            json.dump(header, a_file)
+        os.replace(temporary, folder)
+    except OSError:
+        # folder already exists, it was saved by other process
+        if load_compiled(folder) is None:
+            raise
+    finally:
+        shutil.rmtree(temporary, ignore_errors=True)
+
+
+def load_compiled(folder):
+    """
+    loads compiled instance from folder, arrays are memory-mapped
+    :return: compiled instance. None if folder does not contain it.
+    """
+    header_filename = os.path.join(folder, 'header.json')
+    if not os.path.exists(header_filename):
+        return None
+    with open(header_filename, mode='r', encoding='utf-8') as a_file:
+        compiled = json.load(a_file)
+    for name in ARRAYS:
+        compiled[name] = np.load(os.path.join(folder, name + '.npy'), mmap_mode='r')
+    return compiled
+
+
+def load_instance(filename, cache_dir=None):
+    """
+    loads instance from file, parsing it only once per process. Instances are shared, so they must not be modified.
+    :param filename: filename
+    :param cache_dir: folder of disk cache of compiled instances keyed by hash of file, not used if None
+    :return: a dictionary, which represents an instance of problem
+    """
+    stat = os.stat(filename)
+    return _load_instance(os.path.abspath(filename), stat.st_mtime_ns, stat.st_size, cache_dir)
+
+
+@functools.lru_cache(maxsize=256)
+def _load_instance(filename, mtime, size, cache_dir):
+    """
+    loads instance from file or disk cache, modification time and size of file are part of key of in-process cache
+    """
+    if cache_dir is None:
+        return to_instance(read_compiled(filename))
+
+    folder = os.path.join(cache_dir, file_hash(filename))
+    compiled = load_compiled(folder)
+    if compiled is None:
+        compiled = read_compiled(filename)
+        save_compiled(compiled, folder)
+    return to_instance(compiled)
+
+
+def read_compiled(filename):
+    """
+    reads compiled instance from file in DIMACS format (by extension) or in format of instance_generator
+    """
+    if dimacs.is_dimacs(filename):
+        return dimacs.read_dimacs(filename)
+    with open(filename, mode='r', encoding='utf-8') as a_file:
+        return parse_instance(a_file.read())
+
+
+def file_hash(filename, chunk_size=1 << 22):
+    """
+    returns SHA-1 of content of file, read chunk by chunk
+    """
+    digest = hashlib.sha1()
+    with open(filename, mode='rb') as a_file:
+        for chunk in iter(lambda: a_file.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
@@ -1,5 +1,9 @@
 import random
 import os
+import json
+import numpy as np
+import dimacs
+import parallel_runner
 
 def generate_instance(clauses_to_variables_ratio, n_clauses):
     """
@@ -31,44 +35,136 @@ def generate_instance_str(clauses_to_variables_ratio, n_clauses):
     :param n_clauses: number of clauses
     :return: a string, which represents an instance of problem
     """
-    output = ''
+    # parts are collected in a list and joined once, repeated concatenation of string is quadratic
+    output = []
     n_var = int (n_clauses/clauses_to_variables_ratio)
-    output += str(n_var) + ' ' + str(n_clauses) + ' 0 '
+    output.append(str(n_var) + ' ' + str(n_clauses) + ' 0 ')
     for clause_index in range(n_clauses):
         for var_index in range(3):
             var = random.randint(1, n_var)
             if(random.randint(0,1) == 1):
                 var *= -1
-            output += str(var) + ' '
-        output += '0 '
-    output += '% '
+            output.append(str(var) + ' ')
+        output.append('0 ')
+    output.append('% ')
     for var_index in range(n_var):
-        output += str(random.randint(1,100)) + ' '
-    output += '#'
-    return output
+        output.append(str(random.randint(1,100)) + ' ')
+    output.append('#')
+    return ''.join(output)
 
 
-def generate_instances_to_files (clauses_to_variables_ratio, n_clauses, n_instances, folder):
+def generate_instances_to_files (clauses_to_variables_ratio, n_clauses, n_instances, folder, file_format='txt'):
     """
     generates specified number of instances of 3 SAT problem and saves them to specified folder
     :param clauses_to_variables_ratio:
     :param n_clauses: number of clauses
     :param n_instances: number of instances
     :param folder: name of folder where to save generated instances
+    :param file_format: 'txt' for format of this project, 'cnf' or 'wcnf' for DIMACS, optionally compressed
+    ('cnf.gz', 'wcnf.xz', ...)
     :return:
     """
     if not os.path.exists(folder):
         os.makedirs(folder)
     filenames = []
     for i in range(n_instances):
-        instance = generate_instance_str(clauses_to_variables_ratio, n_clauses)
-        filename = folder + '/3_SAT_' + str(n_clauses) + '_' + str(clauses_to_variables_ratio) + '_' + str(i) + '.txt'
+        filename = folder + '/3_SAT_' + str(n_clauses) + '_' + str(clauses_to_variables_ratio) + '_' + str(i) + '.' + file_format
         filenames.append(filename)
-        with open(filename, mode='w', encoding='utf-8') as a_file:
-            a_file.write(instance)
+        if file_format == 'txt':
+            instance = generate_instance_str(clauses_to_variables_ratio, n_clauses)
+            with open(filename, mode='w', encoding='utf-8') as a_file:
+                a_file.write(instance)
+        else:
+            dimacs.write_dimacs(generate_instance(clauses_to_variables_ratio, n_clauses), filename)
     print('Files ', filenames, ' generated.')
 
 
+def generate_instance_arrays(clauses_to_variables_ratio, n_clauses, seed):
+    """
+    generates an instance of 3 SAT problem at once with numpy
+    :param clauses_to_variables_ratio:
+    :param n_clauses: number of clauses
+    :param seed: seed of instance
+    :return: matrix of clauses (one row per clause) and array of weights
+    """
+    generator = np.random.default_rng(seed)
+    n_var = int (n_clauses/clauses_to_variables_ratio)
+    clauses = generator.integers(1, n_var + 1, size=(n_clauses, 3))
+    clauses[generator.integers(0, 2, size=(n_clauses, 3)) == 1] *= -1
+    weights = generator.integers(1, 101, size=n_var)
+    return clauses, weights
+
+
+def write_instance_arrays(clauses, weights, filename):
+    """
+    writes instance given by matrix of clauses and array of weights to file with a single write,
+    format is chosen by extension of filename, see generate_instances_to_files
+    """
+    if dimacs.is_dimacs(filename):
+        instance = {'n_var': len(weights), 'n_clauses': len(clauses), 'clauses': clauses.tolist(),
+                    'weights': weights.tolist()}
+        dimacs.write_dimacs(instance, filename)
+        return
+    terminated = np.hstack([clauses, np.zeros((len(clauses), 1), dtype=clauses.dtype)])
+    output = (str(len(weights)) + ' ' + str(len(clauses)) + ' 0 ' + ' '.join(map(str, terminated.ravel().tolist())) +
+              ' % ' + ' '.join(map(str, weights.tolist())) + ' #')
+    with open(filename, mode='w', encoding='utf-8', buffering=1 << 20) as a_file:
+        a_file.write(output)
+
+
+def write_instances_chunk(clauses_to_variables_ratio, n_clauses, seed, indices, filenames):
+    """
+    generates and writes instances with given indices, used as a job of parallel runner
+    :return: list of manifest records of written instances
+    """
+    records = []
+    for index, filename in zip(indices, filenames):
+        instance_seed = parallel_runner.derive_seed(seed, index)
+        clauses, weights = generate_instance_arrays(clauses_to_variables_ratio, n_clauses, instance_seed)
+        write_instance_arrays(clauses, weights, filename)
+        records.append({'filename': os.path.basename(filename), 'index': index, 'seed': instance_seed,
+                        'n_var': len(weights), 'n_clauses': n_clauses})
+    return records
+
+
+def generate_instances_bulk(clauses_to_variables_ratio, n_clauses, n_instances, folder, seed=None, file_format='txt',
+                            n_workers=1, chunk_size=100):
+    """
+    generates instances of 3 SAT problem with numpy, each from its own seed derived from seed of batch,
+    writes them to folder, optionally in parallel, and writes manifest.json describing them
+    :param clauses_to_variables_ratio:
+    :param n_clauses: number of clauses
+    :param n_instances: number of instances
+    :param folder: name of folder where to save generated instances
+    :param seed: seed of batch, random if None (it is saved to manifest, so batch can always be reproduced)
+    :param file_format: 'txt', 'cnf' or 'wcnf', see generate_instances_to_files
+    :param n_workers: number of processes writing instances, all cores if None
+    :param chunk_size: number of instances generated by one job
+    :return: manifest
+    """
+    if seed is None:
+        seed = int(np.random.SeedSequence().generate_state(1, dtype=np.uint64)[0])
+    if not os.path.exists(folder):
+        os.makedirs(folder)
+    jobs = []
+    for start in range(0, n_instances, chunk_size):
+        indices = list(range(start, min(start + chunk_size, n_instances)))
+        filenames = [folder + '/3_SAT_' + str(n_clauses) + '_' + str(clauses_to_variables_ratio) + '_' + str(i) + '.' +
+                     file_format for i in indices]
+        jobs.append((clauses_to_variables_ratio, n_clauses, seed, indices, filenames))
+
+    records = []
+    for job, chunk_records in parallel_runner.run_jobs(write_instances_chunk, jobs, n_workers):
+        records.extend(chunk_records)
+    records.sort(key=lambda record: record['index'])
+
+    manifest = {'clauses_to_variables_ratio': clauses_to_variables_ratio, 'n_clauses': n_clauses,
+                'n_instances': n_instances, 'seed': seed, 'file_format': file_format, 'instances': records}
+    with open(os.path.join(folder, 'manifest.json'), mode='w', encoding='utf-8') as a_file:
+        json.dump(manifest, a_file, indent=1)
+    return manifest
+
+
 if __name__ == "__main__":
     clauses_to_variables_ratio = 4.5
     n_clauses = 70
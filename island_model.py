@@ -0,0 +1,177 @@
+import multiprocessing
+import os
+import queue
+import random
+import genetic_algorithm
+import parallel_runner
+
+TOPOLOGIES = ['ring', 'random']
+# how often (in seconds) parent checks, that islands, which did not report result yet, are still running
+POLL_SECONDS = 1.0
+
+
+def create_exchange(index, inboxes, topology, finished, rng):
+    """
+    returns function exchanging migrants of island with other islands, usable as 'exchange' of migration of GA.
+    Migration is asynchronous: emigrants are sent to inbox of target island and immigrants, which arrived so far,
+    are taken from own inbox, so that islands never wait for each other.
+    :param index: index of island
+    :param inboxes: list of queues of migrants, one per island
+    :param topology: 'ring' sends migrants to the next island, 'random' to a random other island
+    :param finished: event, which is set when any island found solution and all islands should stop
+    :param rng: random generator choosing target islands
+    """
+    n_islands = len(inboxes)
+
+    def exchange(emigrants):
+        if finished.is_set():
+            return None
+        if topology == 'ring':
+            target = (index + 1) % n_islands
+        else:
+            target = rng.choice([other for other in range(n_islands) if other != index])
+        inboxes[target].put(emigrants)
+
+        immigrants = []
+        while True:
+            try:
+                immigrants.extend(inboxes[index].get_nowait())
+            except queue.Empty:
+                break
+        return immigrants[-len(emigrants):]
+    return exchange
+
+
+def is_finished(solution, options):
+    """
+    returns True if solution satisfies stopping condition of options, so that other islands can stop
+    """
+    if solution is None:
+        return False
+    if options.get('stop_on_valid', False):
+        return True
+    target = options.get('target_weights_sum')
+    return target is not None and solution['weights_sum'] >= target
+
+
+def island_checkpoint(filename, index):
+    """
+    returns checkpoint file of island, derived from checkpoint file of run, so that islands do not overwrite
+    checkpoints of each other
+    """
+    root, extension = os.path.splitext(filename)
+    return root + '_island' + str(index) + extension
+
+
+def collect_results(processes, finished, results):
+    """
+    returns pairs (index of island, solution or exception) put to queue of results by all islands.
+    Queue is read with timeout, so that island process, which ended without result (killed, crashed or failed
+    to send it), is noticed: other islands are then stopped and RuntimeError is raised.
+    """
+    solutions = {}
+    while len(solutions) < len(processes):
+        try:
+            index, solution = results.get(timeout=POLL_SECONDS)
+            solutions[index] = solution
+            continue
+        except queue.Empty:
+            pass
+        ended = [index for index, process in enumerate(processes)
+                 if process.exitcode is not None and index not in solutions]
+        if not ended:
+            continue
+        # result of island, which ended just now, can still be in queue
+        while True:
+            try:
+                index, solution = results.get_nowait()
+                solutions[index] = solution
+            except queue.Empty:
+                break
+        lost = [index for index in ended if index not in solutions]
+        if lost:
+            finished.set()
+            for process in processes:
+                if process.exitcode is None:
+                    process.terminate()
+                process.join()
+            raise RuntimeError('Island ' + str(lost[0]) + ' ended without result, exit code '
+                               + str(processes[lost[0]].exitcode))
+    return list(solutions.items())
+
+
+def run_island(index, instance, seed, parameters, options, inboxes, finished, results):
+    """
+    runs genetic algorithm of one island in worker process and puts its solution to queue of results,
+    or exception raised by genetic algorithm, in which case other islands are stopped too
+    :param parameters: number of individuals of island, number of iterations, crossover and mutation probabilities,
+    interval of migrations, number of migrants and topology
+    """
+    n_individuals, n_iterations, crossover_probability, mutation_probability, interval, n_migrants, topology = \
+        parameters
+    if options.get('checkpoint') is not None:
+        options = dict(options, checkpoint=island_checkpoint(options['checkpoint'], index))
+    random.seed(seed)
+    migration = {'interval': interval, 'n_migrants': n_migrants,
+                 'exchange': create_exchange(index, inboxes, topology, finished, random.Random(seed))}
+    try:
+        solution = genetic_algorithm.run(instance, n_individuals, n_iterations, crossover_probability,
+                                         mutation_probability, migration=migration, **options)
+    except Exception as error:
+        solution = error
+    if isinstance(solution, Exception) or is_finished(solution, options):
+        finished.set()
+    # migrants, which nobody will receive, must not keep process from exiting
+    for inbox in inboxes:
+        inbox.cancel_join_thread()
+    results.put((index, solution))
+
+
+def run(instance, n_individuals, n_iterations, crossover_probability, mutation_probability, n_islands=None,
+        interval=10, n_migrants=2, topology='ring', seed=None, **options):
+    """
+    runs island model of genetic algorithm: independent populations evolve in worker processes and every interval
+    generations send their best individuals to other islands, where they replace the worst individuals
+    :param instance: a dictionary, which represents an instance of problem
+    :param n_individuals: number of individuals of each island
+    :param n_islands: number of islands (worker processes), all cores if None
+    :param interval: number of generations between migrations
+    :param n_migrants: number of individuals sent by island in each migration
+    :param topology: 'ring' or 'random'
+    :param seed: seed, from which seeds of islands are derived, taken from random if None
+    :param options: optional settings of genetic_algorithm.run, used by every island. Each island saves
+    its own checkpoint, named by island_checkpoint. Resumed islands continue from their own populations,
+    but migrants in flight are not saved, so resumed run is not exactly the interrupted one.
+    :return: the best solution of all islands, with index of island, which found it. None if no solution found.
+    Exception raised by genetic algorithm in any island is raised again, RuntimeError is raised, if island
+    process ended without result.
+    """
+    if topology not in TOPOLOGIES:
+        raise ValueError('Unknown topology: ' + str(topology))
+    if n_islands is None:
+        n_islands = os.cpu_count() or 1
+    if seed is None:
+        seed = random.getrandbits(32)
+    parameters = (n_individuals, n_iterations, crossover_probability, mutation_probability, interval, n_migrants,
+                  topology)
+
+    inboxes = [multiprocessing.Queue() for index in range(n_islands)]
+    finished, results = multiprocessing.Event(), multiprocessing.Queue()
+    processes = [multiprocessing.Process(target=run_island,
+                                         args=(index, instance, parallel_runner.derive_seed(seed, index),
+                                               parameters, options, inboxes, finished, results))
+                 for index in range(n_islands)]
+    for process in processes:
+        process.start()
+    # results are taken before joining, so that no process waits for its queue to be emptied
+    solutions = collect_results(processes, finished, results)
+    for process in processes:
+        process.join()
+
+    best = None
+    for index, solution in sorted(solutions, key=lambda pair: pair[0]):
+        if isinstance(solution, Exception):
+            raise solution
+        if solution is not None and (best is None or solution['weights_sum'] > best['weights_sum']):
+            best = dict(solution, island=index)
+    return best
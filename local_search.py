@@ -0,0 +1,170 @@
+import random
+import incremental_fitness
+
+NOISE = 0.5
+
+
+def normalize_clauses(clauses):
+    """
+    removes duplicate literals from clauses and drops tautologies (clauses with a variable and its negation)
+    """
+    normalized = []
+    for clause in clauses:
+        literals = list(dict.fromkeys(clause))
+        if not any(-var in literals for var in literals):
+            normalized.append(literals)
+    return normalized
+
+
+def prepare(instance):
+    """
+    prepares instance for local search, clauses without duplicate literals and tautologies keep break counts exact
+    :param instance: a dictionary, which represents an instance of problem
+    :return: a dictionary with clauses, index of occurrences of variables and weights
+    """
+    clauses = normalize_clauses(instance['clauses'])
+    return {'clauses': clauses,
+            'occurrences': incremental_fitness.build_occurrences({'n_var': instance['n_var'], 'clauses': clauses}),
+            'weights': instance['weights']}
+
+
+def create_search_state(individual, prepared):
+    """
+    returns state of local search: number of satisfied literals and sum of indices of variables of satisfied literals
+    in each clause, unsatisfied clauses, and for each variable break count (clauses, which become unsatisfied when
+    it is flipped) and make count (unsatisfied clauses, which become satisfied when it is flipped)
+    """
+    clauses = prepared['clauses']
+    n_var = len(individual)
+    counts, true_sums = [0] * len(clauses), [0] * len(clauses)
+    breaks, makes = [0] * n_var, [0] * n_var
+    unsatisfied, positions = [], {}
+    for clause_index, clause in enumerate(clauses):
+        for var in clause:
+            index = abs(var) - 1
+            if (var > 0) == (individual[index] == 1):
+                counts[clause_index] += 1
+                true_sums[clause_index] += index
+        if counts[clause_index] == 0:
+            positions[clause_index] = len(unsatisfied)
+            unsatisfied.append(clause_index)
+            for var in clause:
+                makes[abs(var) - 1] += 1
+        elif counts[clause_index] == 1:
+            # sum of indices of satisfied literals is index of the only one
+            breaks[true_sums[clause_index]] += 1
+    return {'individual': individual, 'counts': counts, 'true_sums': true_sums, 'breaks': breaks, 'makes': makes,
+            'unsatisfied': unsatisfied, 'positions': positions,
+            'weights_sum': sum(weight for value, weight in zip(individual, prepared['weights']) if value == 1)}
+
+
+def flip(state, index, prepared):
+    """
+    flips variable in place and updates state in O(occurrences of the variable)
+    """
+    individual, counts, true_sums = state['individual'], state['counts'], state['true_sums']
+    breaks, makes, clauses = state['breaks'], state['makes'], prepared['clauses']
+    occurrences = prepared['occurrences']
+    if individual[index] == 0:
+        gained, lost = occurrences['positive'][index], occurrences['negative'][index]
+        individual[index] = 1
+        state['weights_sum'] += prepared['weights'][index]
+    else:
+        gained, lost = occurrences['negative'][index], occurrences['positive'][index]
+        individual[index] = 0
+        state['weights_sum'] -= prepared['weights'][index]
+
+    for clause_index in gained:
+        if counts[clause_index] == 0:
+            remove_unsatisfied(state, clause_index)
+            for var in clauses[clause_index]:
+                makes[abs(var) - 1] -= 1
+            breaks[index] += 1
+        elif counts[clause_index] == 1:
+            breaks[true_sums[clause_index]] -= 1
+        counts[clause_index] += 1
+        true_sums[clause_index] += index
+    for clause_index in lost:
+        counts[clause_index] -= 1
+        true_sums[clause_index] -= index
+        if counts[clause_index] == 0:
+            state['positions'][clause_index] = len(state['unsatisfied'])
+            state['unsatisfied'].append(clause_index)
+            for var in clauses[clause_index]:
+                makes[abs(var) - 1] += 1
+            breaks[index] -= 1
+        elif counts[clause_index] == 1:
+            breaks[true_sums[clause_index]] += 1
+
+
+def remove_unsatisfied(state, clause_index):
+    """
+    removes clause from list of unsatisfied clauses in O(1) by moving the last one to its place
+    """
+    unsatisfied, positions = state['unsatisfied'], state['positions']
+    position = positions.pop(clause_index)
+    last = unsatisfied.pop()
+    if last != clause_index:
+        unsatisfied[position] = last
+        positions[last] = position
+
+
+def score(state, index, prepared, satisfied_clause_bonus):
+    """
+    returns change of fitness (without bonus for satisfied formula) caused by flipping variable
+    """
+    weight = prepared['weights'][index]
+    return ((state['makes'][index] - state['breaks'][index]) * satisfied_clause_bonus +
+            (weight if state['individual'][index] == 0 else -weight))
+
+
+def walksat(individual, prepared, max_flips, satisfied_clause_bonus, noise=NOISE, rng=random):
+    """
+    improves individual by WalkSAT: repeatedly picks random unsatisfied clause and flips its variable, which breaks
+    no satisfied clause, otherwise random variable (with probability noise) or the one with the best change of fitness.
+    When all clauses are satisfied, variables set to 0, which break nothing, are set to 1 starting from the heaviest.
+    :param individual: individual as list of 0 and 1, it is not modified
+    :param prepared: instance prepared by prepare
+    :param max_flips: the highest number of flips
+    :param satisfied_clause_bonus: bonus for satisfied clause, which values clauses against weights
+    :param noise: probability of random walk step
+    :param rng: random generator of run (random.Random), random module if not given
+    :return: the best individual seen during search as list of 0 and 1
+    """
+    state = create_search_state(list(individual), prepared)
+    clauses, breaks = prepared['clauses'], state['breaks']
+    best, best_fitness = state['individual'][:], None
+    for flip_number in range(max_flips):
+        unsatisfied = state['unsatisfied']
+        fitness = (len(clauses) - len(unsatisfied)) * satisfied_clause_bonus + state['weights_sum']
+        if best_fitness is None or fitness > best_fitness:
+            best, best_fitness = state['individual'][:], fitness
+        if not unsatisfied:
+            break
+
+        candidates = [abs(var) - 1 for var in clauses[rng.choice(unsatisfied)]]
+        free = [index for index in candidates if breaks[index] == 0]
+        if free:
+            index = max(free, key=lambda index: score(state, index, prepared, satisfied_clause_bonus))
+        elif rng.random() < noise:
+            index = rng.choice(candidates)
+        else:
+            index = max(candidates, key=lambda index: score(state, index, prepared, satisfied_clause_bonus))
+        flip(state, index, prepared)
+
+    if not state['unsatisfied']:
+        add_weights(state, prepared)
+    fitness = (len(clauses) - len(state['unsatisfied'])) * satisfied_clause_bonus + state['weights_sum']
+    if best_fitness is None or fitness > best_fitness:
+        best = state['individual']
+    return best
+
+
+def add_weights(state, prepared):
+    """
+    sets to 1 variables of satisfying individual, which break no clause, the heaviest first
+    """
+    individual, weights = state['individual'], prepared['weights']
+    for index in sorted(range(len(individual)), key=lambda index: -weights[index]):
+        if individual[index] == 0 and weights[index] > 0 and state['breaks'][index] == 0:
+            flip(state, index, prepared)
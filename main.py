@@ -1,31 +1,27 @@
 import os
+import random
+import batch_solver
+import benchmark
 import genetic_algorithm
+import instance_cache
+import parallel_runner
 from time import time
 
-def load_instance(filename):
+def load_instance(filename, cache_dir=None):
     """
-    loads data from file and processes it into a problem instance accepted by GA
+    loads data from file and processes it into a problem instance accepted by GA,
+    each file is parsed only once per process, see instance_cache
     :param filename: filename
+    :param cache_dir: folder of disk cache of compiled instances, not used if None
     :return: a dictionary, which represents an instance of problem
     """
     if not os.path.exists(filename):
         print('Invalid input: file ', filename, ' does not exist.')
         return
-    with open(filename, mode='r', encoding='utf-8') as a_file:
-        content = a_file.read()
-        clauses_str = content.split(' 0 ')
-        weights_str = clauses_str[-1].replace('%', '').replace('#', '')
-        del clauses_str[-1]
-        nums_str = clauses_str[0]
-        del clauses_str[0]
-        weights = [int(x) for x in weights_str.rstrip().split(' ') if x!= '']
-        clauses = [[int(x) for x in clause.replace('%', '').replace('#', '').split(' ') if x!= ''] for clause in clauses_str]
-        nums = [int(x) for x in nums_str.rstrip().split(' ') if x!= '']
-        n_var, n_clauses = nums[0], nums[1]
-        return {'n_var': n_var, 'n_clauses': n_clauses, 'clauses': clauses, 'weights': weights}
-
-
-def solve_from_file(filename, n_individuals, n_iterations, crossover_probability, mutation_probability):
+    return instance_cache.load_instance(filename, cache_dir)
+
+
+def solve_from_file(filename, n_individuals, n_iterations, crossover_probability, mutation_probability, **options):
     """
     get solution of problem from file
     :param filename: filename
@@ -33,17 +29,44 @@ def solve_from_file(filename, n_individuals, n_iterations, crossover_probability
     :param n_iterations: number of iterations for GA
     :param crossover_probability: crossover probability for GA
     :param mutation_probability: mutation probability for GA
+    :param options: optional settings of GA, see genetic_algorithm.run_anytime_and_set_bonuses
     :return:
     """
     instance = load_instance(filename)
     if instance is not None:
-        solution = genetic_algorithm.run(instance, n_individuals, n_iterations, crossover_probability, mutation_probability)
+        solution = genetic_algorithm.run(instance, n_individuals, n_iterations, crossover_probability, mutation_probability,
+                                         **options)
     else:
         solution = None
     return solution
 
 
-def solve_from_file_with_bonuses(filename, n_individuals, n_iterations, crossover_probability, mutation_probability, satisfied_clause_bonus, satisfied_formula_bonus):
+def solve_batch_from_files(filenames, n_individuals, n_iterations, crossover_probability, mutation_probability,
+                           **options):
+    """
+    get solutions of problems from files, all of them are solved together by one vectorized run of GA.
+    Files, which cannot be loaded, are reported and left out of the run.
+    :param filenames: list of filenames
+    :param options: optional settings of GA, see batch_solver.run_and_set_bonuses
+    :return: list of solutions, None for problems without solution and for files, which cannot be loaded
+    """
+    instances = {}
+    for number, filename in enumerate(filenames):
+        try:
+            instance = load_instance(filename)
+        except (OSError, ValueError) as error:
+            print('Invalid input: file ', filename, ' cannot be loaded: ', error)
+            continue
+        if instance is not None:
+            instances[number] = instance
+    solutions = batch_solver.run(list(instances.values()), n_individuals, n_iterations, crossover_probability,
+                                 mutation_probability, **options)
+    solved = dict(zip(instances, solutions))
+    return [solved.get(number) for number in range(len(filenames))]
+
+
+def solve_from_file_with_bonuses(filename, n_individuals, n_iterations, crossover_probability, mutation_probability, satisfied_clause_bonus, satisfied_formula_bonus,
+                                 **options):
     """
     get solution of problem from file with certain values of bonuses
     :param filename: filename
@@ -53,17 +76,33 @@ def solve_from_file_with_bonuses(filename, n_individuals, n_iterations, crossove
     :param mutation_probability: mutation probability for GA
     :param satisfied_clause_bonus: bonus for satisfied clause
     :param satisfied_formula_bonus: bonus for satisfied formula
+    :param options: optional settings of GA, see genetic_algorithm.run_anytime_and_set_bonuses
     :return:
     """
     instance = load_instance(filename)
     if instance is not None:
-        solution = genetic_algorithm.run_and_set_bonuses(instance, n_individuals, n_iterations, crossover_probability, mutation_probability, satisfied_clause_bonus, satisfied_formula_bonus)
+        solution = genetic_algorithm.run_and_set_bonuses(instance, n_individuals, n_iterations, crossover_probability, mutation_probability, satisfied_clause_bonus, satisfied_formula_bonus,
+                                                         **options)
     else:
         solution = None
     return solution
 
 
-def measure_time(filenames_all, n_individuals, n_iterations, crossover_probability, mutation_probability):
+def solve_job(filename, seed, n_individuals, n_iterations, crossover_probability, mutation_probability):
+    """
+    solves problem from file with seeded random generator, used as a job of parallel runner
+    :param filename: filename
+    :param seed: seed of random generator, None for seed from system
+    :return: solution and runtime in seconds
+    """
+    random.seed(seed)
+    t0 = time()
+    solution = solve_from_file(filename, n_individuals, n_iterations, crossover_probability, mutation_probability)
+    return solution, time() - t0
+
+
+def measure_time(filenames_all, n_individuals, n_iterations, crossover_probability, mutation_probability, n_workers=1,
+                 seed=None):
     """
     measures runtime for solving instances of different sizes
     :param filenames_all: structured array of sizes of instances and filenames
@@ -71,30 +110,39 @@ def measure_time(filenames_all, n_individuals, n_iterations, crossover_probabili
     :param n_iterations: number of iterations for GA
     :param crossover_probability: crossover probability for GA
     :param mutation_probability: mutation probability for GA
+    :param n_workers: number of processes solving instances in parallel, all cores if None. Runs competing
+    for cores take longer, so times measured by more than 1 process are not comparable to sequential ones.
+    :param seed: seed, from which seeds of jobs are derived. Seeds from system if None
     :return: structured array with sizes of instances (number of clauses in formula) and corresponding runtime
     """
-    time_array=[]
+    jobs, sizes = [], {}
     for pair in filenames_all:
         n, filenames = pair[0], pair[1]
-        execution_time = 0
+        sizes[n] = {'remaining': len(filenames), 'total': len(filenames), 'value': 0}
         for filename in filenames:
-            t0 = time()
-            # for i in range(100):
-            solution = solve_from_file(filename, n_individuals, n_iterations, crossover_probability, mutation_probability)
-            # execution_time=(time() - t0)/100
-            execution_time += (time() - t0)/len(filenames)
-        print(n, ": ", execution_time, "s")
-        time_array.append((n, execution_time))
-
+            jobs.append((filename, None if seed is None else parallel_runner.derive_seed(seed, len(jobs)), n_individuals, n_iterations,
+                         crossover_probability, mutation_probability))
+    sizes_of_files = {filename: n for n, filenames in filenames_all for filename in filenames}
+
+    for job, (solution, execution_time) in parallel_runner.run_jobs(solve_job, jobs, n_workers):
+        n = sizes_of_files[job[0]]
+        sizes[n]['value'] += execution_time
+        sizes[n]['remaining'] -= 1
+        if sizes[n]['remaining'] == 0:
+            sizes[n]['value'] /= sizes[n]['total']
+            print(n, ": ", sizes[n]['value'], "s")
+
+    time_array = [(n, sizes[n]['value']) for n, filenames in filenames_all]
     print(time_array)
     return time_array
 
 
 def set_parameters(filenames, n_individuals, n_iterations, crossover_probability, mutation_probability):
     """
-    calculates performance of algorithm for different values of parameters
+    calculates performance of algorithm for different values of parameters (population size),
+    see tuning.successive_halving for searching bigger spaces of parameters
     :param filenames: list of filenames
-    :param n_individuals: number of individuals for GA
+    :param n_individuals: not used, population sizes from 30 to 100 are tried
     :param n_iterations: number of iterations for GA
     :param crossover_probability: crossover probability for GA
     :param mutation_probability: mutation probability for GA
@@ -104,7 +152,7 @@ def set_parameters(filenames, n_individuals, n_iterations, crossover_probability
     for p in [30, 40, 50, 60, 70, 80, 90, 100]:
         n_solutions = 0
         for filename in filenames:
-            solution = solve_from_file(filename=filename, n_individuals=n_individuals, n_iterations=n_iterations,
+            solution = solve_from_file(filename=filename, n_individuals=p, n_iterations=n_iterations,
                                        crossover_probability=crossover_probability, mutation_probability=mutation_probability)
             if solution is not None:
                 n_solutions += 1
@@ -137,7 +185,8 @@ def set_bonuses(filenames, n_individuals, n_iterations, crossover_probability, m
     print(result)
 
 
-def meassure_performance(filenames_all, n_individuals, n_iterations, crossover_probability, mutation_probability):
+def meassure_performance(filenames_all, n_individuals, n_iterations, crossover_probability, mutation_probability,
+                         n_workers=None, seed=None, n_repetitions=10):
     """
     calculates for how many instances algorithm finds solution
     :param filenames_all: structured array of sizes of instances and filenames
@@ -145,21 +194,31 @@ def meassure_performance(filenames_all, n_individuals, n_iterations, crossover_p
     :param n_iterations: number of iterations for GA
     :param crossover_probability: crossover probability for GA
     :param mutation_probability: mutation probability for GA
+    :param n_workers: number of processes solving instances in parallel, all cores if None
+    :param seed: seed, from which seeds of jobs are derived. Seeds from system if None
+    :param n_repetitions: how many times each instance is solved
     :return: array of sizes of instances and corresponding performance (solved instances ratio)
     """
-    time_array=[]
+    jobs, sizes = [], {}
     for pair in filenames_all:
-        n_solutions = 0
-        for i in range(10):
-            n, filenames = pair[0], pair[1]
+        n, filenames = pair[0], pair[1]
+        sizes[n] = {'remaining': len(filenames) * n_repetitions, 'total': len(filenames) * n_repetitions, 'value': 0}
+        for i in range(n_repetitions):
             for filename in filenames:
-                solution = solve_from_file(filename, n_individuals, n_iterations, crossover_probability, mutation_probability)
-                if solution is not None:
-                    n_solutions += 1
-
-        print(n, ": ", n_solutions/len(filenames)/10)
-        time_array.append((n, n_solutions/len(filenames)/10))
-
+                jobs.append((filename, None if seed is None else parallel_runner.derive_seed(seed, len(jobs)), n_individuals, n_iterations,
+                             crossover_probability, mutation_probability))
+    sizes_of_files = {filename: n for n, filenames in filenames_all for filename in filenames}
+
+    for job, (solution, execution_time) in parallel_runner.run_jobs(solve_job, jobs, n_workers):
+        n = sizes_of_files[job[0]]
+        if solution is not None:
+            sizes[n]['value'] += 1
+        sizes[n]['remaining'] -= 1
+        if sizes[n]['remaining'] == 0:
+            sizes[n]['value'] /= sizes[n]['total']
+            print(n, ": ", sizes[n]['value'])
+
+    time_array = [(n, sizes[n]['value']) for n, filenames in filenames_all]
     print(time_array)
     return time_array
 
@@ -169,46 +228,9 @@ if __name__ == "__main__":
     n_iterations = 500
     crossover_probability = 0.7
     mutation_probability = 0.06
-    filenames = ['./instances/3_SAT_50_4.5_0.txt', './instances/3_SAT_50_4.5_1.txt', './instances/3_SAT_50_4.5_2.txt',
-                 './instances/3_SAT_50_4.5_3.txt', './instances/3_SAT_50_4.5_4.txt', './instances/3_SAT_50_4.5_5.txt',
-                 './instances/3_SAT_50_4.5_6.txt', './instances/3_SAT_50_4.5_7.txt', './instances/3_SAT_50_4.5_8.txt',
-                 './instances/3_SAT_50_4.5_9.txt', './instances/3_SAT_50_4.5_10.txt', './instances/3_SAT_50_4.5_11.txt',
-                 './instances/3_SAT_50_4.5_12.txt', './instances/3_SAT_50_4.5_13.txt', './instances/3_SAT_50_4.5_14.txt',
-                 './instances/3_SAT_50_4.5_15.txt', './instances/3_SAT_50_4.5_16.txt', './instances/3_SAT_50_4.5_17.txt',
-                 './instances/3_SAT_50_4.5_18.txt', './instances/3_SAT_50_4.5_19.txt', './instances/3_SAT_50_4.5_20.txt',
-                 './instances/3_SAT_50_4.5_21.txt', './instances/3_SAT_50_4.5_22.txt', './instances/3_SAT_50_4.5_23.txt',
-                 './instances/3_SAT_50_4.5_24.txt', './instances/3_SAT_50_4.5_25.txt', './instances/3_SAT_50_4.5_26.txt',
-                 './instances/3_SAT_50_4.5_27.txt', './instances/3_SAT_50_4.5_28.txt', './instances/3_SAT_50_4.5_29.txt',
-                 './instances/3_SAT_50_4.5_30.txt', './instances/3_SAT_50_4.5_31.txt', './instances/3_SAT_50_4.5_32.txt',
-                 './instances/3_SAT_50_4.5_33.txt', './instances/3_SAT_50_4.5_34.txt', './instances/3_SAT_50_4.5_35.txt',
-                 './instances/3_SAT_50_4.5_36.txt', './instances/3_SAT_50_4.5_37.txt', './instances/3_SAT_50_4.5_38.txt',
-                 './instances/3_SAT_50_4.5_39.txt', './instances/3_SAT_50_4.5_40.txt', './instances/3_SAT_50_4.5_41.txt',
-                 './instances/3_SAT_50_4.5_42.txt', './instances/3_SAT_50_4.5_43.txt', './instances/3_SAT_50_4.5_44.txt',
-                 './instances/3_SAT_50_4.5_45.txt', './instances/3_SAT_50_4.5_46.txt', './instances/3_SAT_50_4.5_47.txt',
-                 './instances/3_SAT_50_4.5_48.txt', './instances/3_SAT_50_4.5_49.txt']
-    filenames_all = [ (30, ['./instances/3_SAT_30_4.5_0.txt', './instances/3_SAT_30_4.5_1.txt', './instances/3_SAT_30_4.5_2.txt', './instances/3_SAT_30_4.5_3.txt', './instances/3_SAT_30_4.5_4.txt', './instances/3_SAT_30_4.5_5.txt', './instances/3_SAT_30_4.5_6.txt', './instances/3_SAT_30_4.5_7.txt', './instances/3_SAT_30_4.5_8.txt', './instances/3_SAT_30_4.5_9.txt', './instances/3_SAT_30_4.5_10.txt', './instances/3_SAT_30_4.5_11.txt', './instances/3_SAT_30_4.5_12.txt', './instances/3_SAT_30_4.5_13.txt', './instances/3_SAT_30_4.5_14.txt', './instances/3_SAT_30_4.5_15.txt', './instances/3_SAT_30_4.5_16.txt', './instances/3_SAT_30_4.5_17.txt', './instances/3_SAT_30_4.5_18.txt', './instances/3_SAT_30_4.5_19.txt', './instances/3_SAT_30_4.5_20.txt', './instances/3_SAT_30_4.5_21.txt', './instances/3_SAT_30_4.5_22.txt', './instances/3_SAT_30_4.5_23.txt', './instances/3_SAT_30_4.5_24.txt', './instances/3_SAT_30_4.5_25.txt', './instances/3_SAT_30_4.5_26.txt', './instances/3_SAT_30_4.5_27.txt', './instances/3_SAT_30_4.5_28.txt', './instances/3_SAT_30_4.5_29.txt']),
-                      (40, ['./instances/3_SAT_40_4.5_0.txt', './instances/3_SAT_40_4.5_1.txt', './instances/3_SAT_40_4.5_2.txt', './instances/3_SAT_40_4.5_3.txt', './instances/3_SAT_40_4.5_4.txt', './instances/3_SAT_40_4.5_5.txt', './instances/3_SAT_40_4.5_6.txt', './instances/3_SAT_40_4.5_7.txt', './instances/3_SAT_40_4.5_8.txt', './instances/3_SAT_40_4.5_9.txt', './instances/3_SAT_40_4.5_10.txt', './instances/3_SAT_40_4.5_11.txt', './instances/3_SAT_40_4.5_12.txt', './instances/3_SAT_40_4.5_13.txt', './instances/3_SAT_40_4.5_14.txt', './instances/3_SAT_40_4.5_15.txt', './instances/3_SAT_40_4.5_16.txt', './instances/3_SAT_40_4.5_17.txt', './instances/3_SAT_40_4.5_18.txt', './instances/3_SAT_40_4.5_19.txt', './instances/3_SAT_40_4.5_20.txt', './instances/3_SAT_40_4.5_21.txt', './instances/3_SAT_40_4.5_22.txt', './instances/3_SAT_40_4.5_23.txt', './instances/3_SAT_40_4.5_24.txt', './instances/3_SAT_40_4.5_25.txt', './instances/3_SAT_40_4.5_26.txt', './instances/3_SAT_40_4.5_27.txt', './instances/3_SAT_40_4.5_28.txt', './instances/3_SAT_40_4.5_29.txt']),
-                      (50, ['./instances/3_SAT_50_4.5_0.txt', './instances/3_SAT_50_4.5_1.txt', './instances/3_SAT_50_4.5_2.txt', './instances/3_SAT_50_4.5_3.txt', './instances/3_SAT_50_4.5_4.txt', './instances/3_SAT_50_4.5_5.txt', './instances/3_SAT_50_4.5_6.txt', './instances/3_SAT_50_4.5_7.txt', './instances/3_SAT_50_4.5_8.txt', './instances/3_SAT_50_4.5_9.txt', './instances/3_SAT_50_4.5_10.txt', './instances/3_SAT_50_4.5_11.txt', './instances/3_SAT_50_4.5_12.txt', './instances/3_SAT_50_4.5_13.txt', './instances/3_SAT_50_4.5_14.txt', './instances/3_SAT_50_4.5_15.txt', './instances/3_SAT_50_4.5_16.txt', './instances/3_SAT_50_4.5_17.txt', './instances/3_SAT_50_4.5_18.txt', './instances/3_SAT_50_4.5_19.txt', './instances/3_SAT_50_4.5_20.txt', './instances/3_SAT_50_4.5_21.txt', './instances/3_SAT_50_4.5_22.txt', './instances/3_SAT_50_4.5_23.txt', './instances/3_SAT_50_4.5_24.txt', './instances/3_SAT_50_4.5_25.txt', './instances/3_SAT_50_4.5_26.txt', './instances/3_SAT_50_4.5_27.txt', './instances/3_SAT_50_4.5_28.txt', './instances/3_SAT_50_4.5_29.txt']),
-                      (60, ['./instances/3_SAT_60_4.5_0.txt', './instances/3_SAT_60_4.5_1.txt', './instances/3_SAT_60_4.5_2.txt', './instances/3_SAT_60_4.5_3.txt', './instances/3_SAT_60_4.5_4.txt', './instances/3_SAT_60_4.5_5.txt', './instances/3_SAT_60_4.5_6.txt', './instances/3_SAT_60_4.5_7.txt', './instances/3_SAT_60_4.5_8.txt', './instances/3_SAT_60_4.5_9.txt', './instances/3_SAT_60_4.5_10.txt', './instances/3_SAT_60_4.5_11.txt', './instances/3_SAT_60_4.5_12.txt', './instances/3_SAT_60_4.5_13.txt', './instances/3_SAT_60_4.5_14.txt', './instances/3_SAT_60_4.5_15.txt', './instances/3_SAT_60_4.5_16.txt', './instances/3_SAT_60_4.5_17.txt', './instances/3_SAT_60_4.5_18.txt', './instances/3_SAT_60_4.5_19.txt', './instances/3_SAT_60_4.5_20.txt', './instances/3_SAT_60_4.5_21.txt', './instances/3_SAT_60_4.5_22.txt', './instances/3_SAT_60_4.5_23.txt', './instances/3_SAT_60_4.5_24.txt', './instances/3_SAT_60_4.5_25.txt', './instances/3_SAT_60_4.5_26.txt', './instances/3_SAT_60_4.5_27.txt', './instances/3_SAT_60_4.5_28.txt', './instances/3_SAT_60_4.5_29.txt']),
-                      (70, ['./instances/3_SAT_70_4.5_0.txt', './instances/3_SAT_70_4.5_1.txt', './instances/3_SAT_70_4.5_2.txt', './instances/3_SAT_70_4.5_3.txt', './instances/3_SAT_70_4.5_4.txt', './instances/3_SAT_70_4.5_5.txt', './instances/3_SAT_70_4.5_6.txt', './instances/3_SAT_70_4.5_7.txt', './instances/3_SAT_70_4.5_8.txt', './instances/3_SAT_70_4.5_9.txt', './instances/3_SAT_70_4.5_10.txt', './instances/3_SAT_70_4.5_11.txt', './instances/3_SAT_70_4.5_12.txt', './instances/3_SAT_70_4.5_13.txt', './instances/3_SAT_70_4.5_14.txt', './instances/3_SAT_70_4.5_15.txt', './instances/3_SAT_70_4.5_16.txt', './instances/3_SAT_70_4.5_17.txt', './instances/3_SAT_70_4.5_18.txt', './instances/3_SAT_70_4.5_19.txt', './instances/3_SAT_70_4.5_20.txt', './instances/3_SAT_70_4.5_21.txt', './instances/3_SAT_70_4.5_22.txt', './instances/3_SAT_70_4.5_23.txt', './instances/3_SAT_70_4.5_24.txt', './instances/3_SAT_70_4.5_25.txt', './instances/3_SAT_70_4.5_26.txt', './instances/3_SAT_70_4.5_27.txt', './instances/3_SAT_70_4.5_28.txt', './instances/3_SAT_70_4.5_29.txt'])]
-
-    results_per_crossover_prob = [[0.1, 0.22], [0.2, 0.18], [0.3, 0.18], [0.4, 0.2], [0.5, 0.2], [0.6, 0.22],
-                                  [0.7, 0.24], [0.8, 0.2], [0.9, 0.2]]
-    results_per_mutation_prob = [[0.0, 0.167], [0.02, 0.3], [0.04, 0.2], [0.06, 0.3], [0.08, 0.3], [0.1, 0.1],
-                                 [0.12, 0.267], [0.14, 0.1], [0.16, 0.167], [0.18, 0.167]]
-    results_per_iteration_size = [[300, 0.2], [400, 0.267], [500, 0.3], [600, 0.33]]
-    results_per_population_size = [[30, 0.2], [40, 0.267], [50, 0.33], [60, 0.233], [70, 0.433],
-                                   [80, 0.433], [90, 0.367], [100, 0.4]]
-    times = [(30, 15.570753757158917), (40, 22.641078138351443), (50, 28.278427457809446), (60, 32.22328717708587), (70, 37.51513407230377)]
-    performance_per_instances_sizes = [(30, 0.5333333333333333), (40, 0.26666666666666666), (50, 0.4), (60, 0.3), (70, 0.06666666666666667)]
-    performance_per_instances_sizes_with_uniform_crossover = [(30, 0.5), (40, 0.3), (50, 0.2), (60, 0.16666666666666666), (70, 0.03333333333333333)]
-    performance_per_instances_sizes_with_tournament_selection = [(30, 0.5333333333333333), (40, 0.3), (50, 0.4), (60, 0.4), (70, 0.26666666666666666)]
-    performance_per_instances_sizes_with_linear_scaling = [(30, 0.5333333333333333), (40, 0.3), (50, 0.43333333333333335), (60, 0.5333333333333333), (70, 0.3)]
-    performance_per_instances_sizes_with_tournament_selection_and_linear_scaling = [(30, 0.4666666666666667), (40, 0.3333333333333333), (50, 0.5), (60, 0.5), (70, 0.3)]
-    performance_per_bonuses = [[100, 200, 0.3], [100, 300, 0.25], [100, 400, 0.3], [100, 500, 0.325], [100, 600, 0.25], [200, 300, 0.3], [200, 400, 0.325], [200, 500, 0.375], [200, 600, 0.4], [200, 700, 0.3], [300, 400, 0.425], [300, 500, 0.3], [300, 600, 0.35], [300, 700, 0.375], [300, 800, 0.375], [400, 500, 0.375], [400, 600, 0.425], [400, 700, 0.375], [400, 800, 0.425], [400, 900, 0.375]]
-    performance_final = [(30, 0.4966666666666667), (40, 0.2866666666666667), (50, 0.37333333333333335), (60, 0.38666666666666666), (70, 0.22999999999999998)]
-
-
+    # instances are discovered by glob (or manifest.json), results of earlier runs are kept in plot_data.py
+    filenames_all = benchmark.discover_instances('./instances/3_SAT_*.txt')
+    filenames = dict(filenames_all)[50]
 
     # measure_time(filenames_all, n_individuals, n_iterations, crossover_probability, mutation_probability)
 
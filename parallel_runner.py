@@ -0,0 +1,32 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+
+
+def derive_seed(seed, index):
+    """
+    returns seed of job with given index derived from seed of all jobs, so that random streams of jobs
+    are independent, unlike streams seeded by consecutive numbers
+    """
+    return int(np.random.SeedSequence([seed, index]).generate_state(1, dtype=np.uint64)[0])
+
+
+def run_jobs(function, jobs, n_workers=None):
+    """
+    runs function for each job in a pool of processes and yields results as soon as they finish
+    :param function: function defined at module level, so that it can be sent to worker processes
+    :param jobs: list of tuples of arguments of function
+    :param n_workers: number of worker processes, all cores if None, 1 runs jobs in current process
+    :return: generator of pairs (job, result) in order of finishing
+    """
+    if n_workers is None:
+        n_workers = os.cpu_count() or 1
+    if n_workers == 1:
+        for job in jobs:
+            yield job, function(*job)
+        return
+
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        futures = {executor.submit(function, *job): job for job in jobs}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
@@ -0,0 +1,60 @@
+import numpy as np
+
+
+def create_buffers(n_individuals, individual_size):
+    """
+    returns buffers of population of 0 and 1 and scratch arrays of its operators, all allocated once for whole run
+    :return: a dictionary with back buffer of population, into which selection writes, and scratch arrays
+    """
+    n_pairs = n_individuals // 2
+    return {'back': np.empty((n_individuals, individual_size), dtype=np.uint8),
+            'mask': np.empty((n_pairs, individual_size), dtype=bool),
+            'difference': np.empty((n_pairs, individual_size), dtype=np.uint8),
+            'random': np.empty((n_pairs, individual_size)),
+            'columns': np.arange(individual_size)}
+
+
+def gather(buffers, population, selected):
+    """
+    writes selected rows of population into back buffer and swaps buffers
+    :param population: front buffer, matrix of individuals
+    :param selected: indices of selected individuals
+    :return: new population (former back buffer)
+    """
+    back = buffers['back']
+    np.take(population, selected, axis=0, out=back)
+    buffers['back'] = population
+    return back
+
+
+def crossover_population(buffers, population, probability, generator, uniform=False):
+    """
+    performs crossover of pairs of neighbouring individuals in place, variables are swapped by xor with
+    their difference, so that no array of size of population is allocated
+    :param uniform: uniform crossover instead of one point crossover
+    """
+    n_pairs = len(population) // 2
+    first, second = population[0:2 * n_pairs:2], population[1:2 * n_pairs:2]
+    mask, difference = buffers['mask'], buffers['difference']
+    if uniform:
+        generator.random(out=buffers['random'])
+        np.less(buffers['random'], 0.5, out=mask)
+    else:
+        points = generator.integers(0, population.shape[1], size=n_pairs)
+        np.greater_equal(buffers['columns'], points[:, None], out=mask)
+    mask &= (generator.random(n_pairs) < probability)[:, None]
+
+    np.bitwise_xor(first, second, out=difference)
+    difference &= mask
+    first ^= difference
+    second ^= difference
+    return population
+
+
+def mutation_population(population, probability, generator):
+    """
+    flips one random variable of individuals in place, each individual is mutated with given probability
+    """
+    rows = np.flatnonzero(generator.random(len(population)) < probability)
+    population[rows, generator.integers(0, population.shape[1], size=len(rows))] ^= 1
+    return population
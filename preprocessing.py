@@ -0,0 +1,72 @@
+import local_search
+
+
+def preprocess(instance):
+    """
+    simplifies instance before genetic algorithm: normalizes clauses, then repeats unit propagation and elimination
+    of pure literals, removing satisfied clauses and false literals, until nothing changes. Pure literal is eliminated
+    only if it does not lower sum of weights, variables left without clauses get value with the higher weight.
+    :param instance: a dictionary, which represents an instance of problem
+    :return: a dictionary with reduced instance, values of all variables (None for variables of reduced instance),
+    indices of variables of reduced instance in original one and sum of weights of variables fixed to 1.
+    None if instance is unsatisfiable.
+    """
+    n_var, weights = instance['n_var'], instance['weights']
+    clauses = local_search.normalize_clauses(instance['clauses'])
+    values = [None] * n_var
+
+    while True:
+        assignment = {}
+        for clause in clauses:
+            if len(clause) == 1:
+                index, value = abs(clause[0]) - 1, int(clause[0] > 0)
+                if assignment.get(index, value) != value:
+                    return None
+                assignment[index] = value
+        if not assignment:
+            positive = {var - 1 for clause in clauses for var in clause if var > 0}
+            negative = {-var - 1 for clause in clauses for var in clause if var < 0}
+            for index in positive - negative:
+                if weights[index] >= 0:
+                    assignment[index] = 1
+            for index in negative - positive:
+                if weights[index] <= 0:
+                    assignment[index] = 0
+        if not assignment:
+            break
+
+        reduced_clauses = []
+        for clause in clauses:
+            reduced = [var for var in clause if abs(var) - 1 not in assignment]
+            if len(reduced) < len(clause) and any(assignment.get(abs(var) - 1) == int(var > 0) for var in clause):
+                continue
+            if not reduced:
+                return None
+            reduced_clauses.append(reduced)
+        clauses = reduced_clauses
+        for index, value in assignment.items():
+            values[index] = value
+
+    occurring = {abs(var) - 1 for clause in clauses for var in clause}
+    for index in range(n_var):
+        if values[index] is None and index not in occurring:
+            values[index] = int(weights[index] > 0)
+
+    variables = [index for index in range(n_var) if values[index] is None]
+    new_vars = {index + 1: new_index + 1 for new_index, index in enumerate(variables)}
+    reduced_instance = {'n_var': len(variables), 'n_clauses': len(clauses),
+                        'clauses': [[new_vars[var] if var > 0 else -new_vars[-var] for var in clause]
+                                    for clause in clauses],
+                        'weights': [weights[index] for index in variables]}
+    return {'instance': reduced_instance, 'values': values, 'variables': variables,
+            'fixed_weights_sum': sum(weight for value, weight in zip(values, weights) if value == 1)}
+
+
+def restore(preprocessed, individual):
+    """
+    returns individual of original instance from individual of reduced instance
+    """
+    values = list(preprocessed['values'])
+    for index, value in zip(preprocessed['variables'], individual):
+        values[index] = value
+    return values
@@ -0,0 +1,62 @@
+import json
+from time import perf_counter
+
+PHASES = ['evaluation', 'selection', 'crossover', 'mutation', 'local_search']
+
+
+def create_profiler(on_event=None):
+    """
+    returns profiler collecting time of phases of genetic algorithm, pass it to genetic_algorithm.run
+    :param on_event: function called after each generation with its event (time of its phases), or None
+    :return: a dictionary, which represents profiler
+    """
+    return {'phases': {phase: {'seconds': 0.0, 'calls': 0} for phase in PHASES}, 'evaluations': 0,
+            'generations': 0, 'on_event': on_event, 'generation': {}, 'started': perf_counter()}
+
+
+def lap(profiler, phase, started, evaluations=0):
+    """
+    adds time since started to phase
+    :param evaluations: number of individuals evaluated in this phase
+    :return: current time, start of the next phase
+    """
+    now = perf_counter()
+    profiler['evaluations'] += evaluations
+    profiler['phases'][phase]['seconds'] += now - started
+    profiler['phases'][phase]['calls'] += 1
+    profiler['generation'][phase] = profiler['generation'].get(phase, 0.0) + now - started
+    return now
+
+
+def end_generation(profiler, generation):
+    """
+    sends event of finished generation with time of its phases
+    """
+    profiler['generations'] += 1
+    if profiler['on_event'] is not None:
+        profiler['on_event']({'generation': generation, 'phases': profiler['generation']})
+    profiler['generation'] = {}
+
+
+def report(profiler):
+    """
+    returns structured report: cumulative time, number of calls and share of each phase, fitness evaluations per second
+    """
+    total = sum(phase['seconds'] for phase in profiler['phases'].values())
+    evaluation_seconds = profiler['phases']['evaluation']['seconds']
+    return {'phases': {name: {'seconds': phase['seconds'], 'calls': phase['calls'],
+                              'share': phase['seconds'] / total if total > 0 else 0.0}
+                       for name, phase in profiler['phases'].items()},
+            'generations': profiler['generations'], 'evaluations': profiler['evaluations'],
+            'evaluations_per_second': profiler['evaluations'] / evaluation_seconds if evaluation_seconds > 0 else 0.0,
+            'seconds': perf_counter() - profiler['started']}
+
+
+def event_writer(filename):
+    """
+    returns function, which appends events to file as JSON lines, usable as on_event of profiler
+    """
+    def write(event):
+        with open(filename, mode='a', encoding='utf-8') as a_file:
+            a_file.write(json.dumps(event) + '\n')
+    return write
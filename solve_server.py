@@ -0,0 +1,234 @@
+import argparse
+import asyncio
+import json
+import multiprocessing
+import random
+import socket
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter
+import batch_solver
+import genetic_algorithm
+import instance_cache
+import parallel_runner
+
+PARAMETERS = ['n_individuals', 'n_iterations', 'crossover_probability', 'mutation_probability']
+# options of genetic_algorithm.run, which batch_solver supports too, requests with other options are solved alone
+BATCH_OPTIONS = ['stop_on_valid', 'tournament_size']
+
+
+def load_request_instance(request, cache_dir=None):
+    """
+    returns instance of request, given by 'filename' (parsed once per worker process) or directly as 'instance'
+    """
+    if 'filename' in request:
+        return instance_cache.load_instance(request['filename'], cache_dir)
+    return request['instance']
+
+
+def solve_group(requests, seed, cache_dir=None):
+    """
+    solves requests with the same parameters in worker process, more requests are solved by one batched run of GA.
+    Instance of each request is loaded on its own, request, whose instance cannot be loaded, fails alone.
+    :return: list of solutions (exception for failed request) and time of solving in seconds
+    """
+    random.seed(seed)
+    instances, errors = [], {}
+    for number, request in enumerate(requests):
+        try:
+            instances.append(load_request_instance(request, cache_dir))
+        except Exception as error:
+            errors[number] = error
+    parameters = [requests[0]['parameters'][name] for name in PARAMETERS]
+    options = requests[0].get('options', {})
+    t0 = perf_counter()
+    if len(instances) > 1:
+        solutions = batch_solver.run(instances, *parameters, **options)
+    else:
+        solutions = [genetic_algorithm.run(instance, *parameters, **options) for instance in instances]
+    seconds = perf_counter() - t0
+    solved = iter(solutions)
+    return [errors[number] if number in errors else next(solved) for number in range(len(requests))], seconds
+
+
+def group_key(request, number):
+    """
+    returns key of request, requests with the same key are solved together
+    """
+    options = request.get('options', {})
+    if any(name not in BATCH_OPTIONS for name in options):
+        return 'alone', number
+    return tuple(request['parameters'][name] for name in PARAMETERS), json.dumps(options, sort_keys=True)
+
+
+def create_server(n_workers=None, cache_dir=None, batch_window=0.005, max_batch=256, seed=None):
+    """
+    returns state of solve server
+    :param n_workers: number of worker processes, all cores if None
+    :param cache_dir: folder of disk cache of compiled instances, not used if None
+    :param batch_window: how long (in seconds) requests are collected into one batch
+    :param max_batch: the highest number of requests collected into one batch
+    :param seed: seed, from which seeds of batches are derived, taken from random if None
+    :return: a dictionary, which represents server
+    """
+    # spawned workers do not inherit sockets of clients, which are connected when pool starts new worker
+    pool = ProcessPoolExecutor(max_workers=n_workers, mp_context=multiprocessing.get_context('spawn'))
+    return {'pool': pool, 'queue': asyncio.Queue(), 'cache_dir': cache_dir,
+            'batch_window': batch_window, 'max_batch': max_batch,
+            'seed': random.getrandbits(32) if seed is None else seed, 'n_batches': 0, 'tasks': set(),
+            'stats': {'requests': 0, 'errors': 0, 'queue_seconds': 0.0, 'solve_seconds': 0.0}}
+
+
+async def dispatch(server):
+    """
+    collects queued requests during batch window, groups them and solves each group in worker pool
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        items = [await server['queue'].get()]
+        deadline = loop.time() + server['batch_window']
+        while len(items) < server['max_batch'] and loop.time() < deadline:
+            try:
+                items.append(await asyncio.wait_for(server['queue'].get(), deadline - loop.time()))
+            except asyncio.TimeoutError:
+                break
+
+        groups = {}
+        for number, item in enumerate(items):
+            try:
+                groups.setdefault(group_key(item[0], number), []).append(item)
+            except (KeyError, TypeError) as error:
+                item[1].set_exception(error)
+        for group in groups.values():
+            # event loop keeps only weak references to tasks, so that running ones are kept by server
+            task = asyncio.ensure_future(solve_in_pool(server, group))
+            server['tasks'].add(task)
+            task.add_done_callback(server['tasks'].discard)
+
+
+async def solve_in_pool(server, group):
+    """
+    solves group of requests in worker pool and resolves their futures with responses
+    """
+    seed = parallel_runner.derive_seed(server['seed'], server['n_batches'])
+    server['n_batches'] += 1
+    try:
+        solutions, seconds = await asyncio.get_running_loop().run_in_executor(
+            server['pool'], solve_group, [request for request, future, received in group], seed, server['cache_dir'])
+    except Exception as error:
+        for request, future, received in group:
+            future.set_exception(error)
+        return
+
+    finished = perf_counter()
+    batch_size = sum(not isinstance(solution, Exception) for solution in solutions)
+    for (request, future, received), solution in zip(group, solutions):
+        if isinstance(solution, Exception):
+            future.set_exception(solution)
+            continue
+        queue_seconds = finished - received - seconds
+        server['stats']['requests'] += 1
+        server['stats']['queue_seconds'] += queue_seconds
+        server['stats']['solve_seconds'] += seconds
+        future.set_result({'id': request.get('id'), 'solution': solution, 'queue_seconds': queue_seconds,
+                           'solve_seconds': seconds, 'batch_size': batch_size})
+
+
+def report(server):
+    """
+    returns number of solved requests and their mean latencies in queue and in solving
+    """
+    stats = server['stats']
+    n = stats['requests']
+    return {'requests': n, 'errors': stats['errors'], 'batches': server['n_batches'],
+            'mean_queue_seconds': stats['queue_seconds'] / n if n > 0 else 0.0,
+            'mean_solve_seconds': stats['solve_seconds'] / n if n > 0 else 0.0}
+
+
+async def handle_client(server, reader, writer):
+    """
+    reads requests of client, one JSON per line, and writes responses as soon as they are solved, possibly
+    in other order, responses carry 'id' of request. Request {"type": "stats"} returns report of server.
+    """
+    async def respond(request, future):
+        try:
+            response = await future
+        except Exception as error:
+            server['stats']['errors'] += 1
+            response = {'id': request.get('id'), 'error': repr(error)}
+        writer.write((json.dumps(response) + '\n').encode('utf-8'))
+        await writer.drain()
+
+    tasks = []
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            try:
+                request = json.loads(line)
+            except ValueError as error:
+                server['stats']['errors'] += 1
+                writer.write((json.dumps({'error': repr(error)}) + '\n').encode('utf-8'))
+                continue
+            if not isinstance(request, dict):
+                server['stats']['errors'] += 1
+                writer.write((json.dumps({'error': 'request must be JSON object'}) + '\n').encode('utf-8'))
+                continue
+            if request.get('type') == 'stats':
+                writer.write((json.dumps(report(server)) + '\n').encode('utf-8'))
+                continue
+            future = asyncio.get_running_loop().create_future()
+            server['queue'].put_nowait((request, future, perf_counter()))
+            tasks.append(asyncio.ensure_future(respond(request, future)))
+    finally:
+        # requests read so far are answered even if reading failed
+        await asyncio.gather(*tasks, return_exceptions=True)
+        writer.close()
+
+
+async def serve(host='127.0.0.1', port=8765, unix_path=None, **settings):
+    """
+    runs solve server on localhost TCP port or Unix socket until it is cancelled
+    :param settings: settings of server, see create_server
+    """
+    server = create_server(**settings)
+    dispatcher = asyncio.ensure_future(dispatch(server))
+    if unix_path is not None:
+        listener = await asyncio.start_unix_server(lambda reader, writer: handle_client(server, reader, writer),
+                                                   path=unix_path)
+    else:
+        listener = await asyncio.start_server(lambda reader, writer: handle_client(server, reader, writer),
+                                              host=host, port=port)
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        dispatcher.cancel()
+        server['pool'].shutdown()
+
+
+def solve_remote(requests, host='127.0.0.1', port=8765):
+    """
+    sends requests to solve server and waits for all responses
+    :param requests: list of requests (dictionaries with 'filename' or 'instance', 'parameters' and optional
+    'options' and 'id')
+    :return: list of responses in order of finishing
+    """
+    with socket.create_connection((host, port)) as connection:
+        connection.sendall(''.join(json.dumps(request) + '\n' for request in requests).encode('utf-8'))
+        connection.shutdown(socket.SHUT_WR)
+        with connection.makefile(mode='r', encoding='utf-8') as a_file:
+            return [json.loads(line) for line in a_file]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Runs local server solving instances by genetic algorithm')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix', help='path of Unix socket, used instead of TCP port')
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--cache-dir', help='folder of disk cache of compiled instances')
+    parser.add_argument('--batch-window', type=float, default=0.005)
+    arguments = parser.parse_args()
+    asyncio.run(serve(arguments.host, arguments.port, arguments.unix, n_workers=arguments.workers,
+                      cache_dir=arguments.cache_dir, batch_window=arguments.batch_window))
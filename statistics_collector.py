@@ -0,0 +1,68 @@
+import math
+import numpy as np
+
+
+def create_statistics(n_iterations, n_bins=32, on_generation=None):
+    """
+    returns collector of statistics of generations, pass it to genetic_algorithm.run.
+    All values are kept in arrays allocated in advance, one row per generation.
+    :param n_iterations: number of iterations of GA
+    :param n_bins: size of histogram of numbers of unsatisfied clauses. The first bin counts valid individuals
+    (no unsatisfied clause), the others split numbers from 1 to number of clauses into ranges of equal width.
+    :param on_generation: function called with statistics of each generation, or None
+    :return: a dictionary, which represents collector
+    """
+    n = n_iterations + 1
+    return {'min': np.zeros(n), 'max': np.zeros(n), 'avg': np.zeros(n), 'std': np.zeros(n),
+            'diversity': np.full(n, np.nan), 'unsatisfied_histogram': np.zeros((n, n_bins), dtype=np.int32),
+            'bin_width': None, 'count': 0, 'on_generation': on_generation}
+
+
+def record(statistics, generation, evaluation, n_clauses):
+    """
+    records statistics of generation from its evaluation, fitness is not calculated again
+    :param statistics: collector
+    :param generation: number of generation
+    :param evaluation: evaluation of population, 'matrix' of bits or share of ones of each variable 'ones'
+    is used for diversity if present
+    :param n_clauses: number of clauses
+    """
+    fitnesses = evaluation['fitnesses']
+    statistics['min'][generation] = fitnesses.min()
+    statistics['max'][generation] = fitnesses.max()
+    statistics['avg'][generation] = fitnesses.mean()
+    statistics['std'][generation] = fitnesses.std()
+    if 'matrix' in evaluation or 'ones' in evaluation:
+        # probability that two random individuals differ in a variable, averaged over variables
+        ones = evaluation['ones'] if 'ones' in evaluation else evaluation['matrix'].mean(axis=0)
+        statistics['diversity'][generation] = (2 * ones * (1 - ones)).mean()
+    n_bins = statistics['unsatisfied_histogram'].shape[1]
+    if statistics['bin_width'] is None:
+        # width of bins is chosen once, so that the last bin ends at number of clauses
+        statistics['bin_width'] = max(1, math.ceil(n_clauses / max(1, n_bins - 1)))
+    unsatisfied = n_clauses - np.asarray(evaluation['satisfied'])
+    unsatisfied = np.where(unsatisfied > 0, 1 + (unsatisfied - 1) // statistics['bin_width'], 0)
+    unsatisfied = np.minimum(unsatisfied, n_bins - 1)
+    statistics['unsatisfied_histogram'][generation] = np.bincount(unsatisfied, minlength=n_bins)
+    statistics['count'] = generation + 1
+
+    if statistics['on_generation'] is not None:
+        statistics['on_generation']({'generation': generation, 'min': statistics['min'][generation],
+                                     'max': statistics['max'][generation], 'avg': statistics['avg'][generation],
+                                     'std': statistics['std'][generation],
+                                     'diversity': statistics['diversity'][generation],
+                                     'valid': int(statistics['unsatisfied_histogram'][generation][0])})
+
+
+def csv_writer(filename):
+    """
+    returns function, which appends statistics of generations to CSV file, usable as on_generation of collector
+    """
+    names = ['generation', 'min', 'max', 'avg', 'std', 'diversity', 'valid']
+    with open(filename, mode='w', encoding='utf-8') as a_file:
+        a_file.write(','.join(names) + '\n')
+
+    def write(row):
+        with open(filename, mode='a', encoding='utf-8') as a_file:
+            a_file.write(','.join(str(row[name]) for name in names) + '\n')
+    return write
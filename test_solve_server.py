@@ -0,0 +1,66 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+import solve_server
+
+PARAMETERS = {'n_individuals': 20, 'n_iterations': 20, 'crossover_probability': 0.8, 'mutation_probability': 0.1}
+GOOD = ['instances/3_SAT_30_4.5_0.txt', 'instances/3_SAT_30_4.5_1.txt', 'instances/3_SAT_30_4.5_2.txt']
+
+
+def mixed_requests():
+    """
+    returns requests with the same parameters, so that they are batched together, one of them with missing file
+    """
+    filenames = GOOD + ['instances/nope.txt']
+    return [{'id': number, 'filename': filename, 'parameters': PARAMETERS} for number, filename in enumerate(filenames)]
+
+
+async def solve_through_server(lines, unix_path):
+    """
+    starts server on Unix socket, sends lines of requests in one connection and returns responses
+    """
+    server = asyncio.ensure_future(solve_server.serve(unix_path=unix_path, n_workers=1, batch_window=0.5, seed=1))
+    while not os.path.exists(unix_path):
+        await asyncio.sleep(0.01)
+    reader, writer = await asyncio.open_unix_connection(unix_path)
+    writer.write(''.join(line + '\n' for line in lines).encode('utf-8'))
+    writer.write_eof()
+    responses = [json.loads(line) for line in (await reader.read()).decode('utf-8').splitlines()]
+    writer.close()
+    server.cancel()
+    return responses
+
+
+class TestMixedBatch(unittest.TestCase):
+    def test_solve_group_fails_only_bad_request(self):
+        solutions, seconds = solve_server.solve_group(mixed_requests(), seed=1)
+        self.assertEqual(len(solutions), 4)
+        self.assertIsInstance(solutions[3], FileNotFoundError)
+        for solution in solutions[:3]:
+            self.assertNotIsInstance(solution, Exception)
+
+    def test_server_batches_good_requests_of_mixed_batch(self):
+        with tempfile.TemporaryDirectory() as folder:
+            lines = [json.dumps(request) for request in mixed_requests()]
+            responses = asyncio.run(solve_through_server(lines, os.path.join(folder, 'server.sock')))
+        responses = {response['id']: response for response in responses}
+        self.assertEqual(sorted(responses), [0, 1, 2, 3])
+        self.assertIn('FileNotFoundError', responses[3]['error'])
+        for number in range(3):
+            self.assertNotIn('error', responses[number])
+            self.assertEqual(responses[number]['batch_size'], 3)
+
+    def test_server_answers_requests_around_non_object_lines(self):
+        request = json.dumps({'id': 0, 'filename': GOOD[0], 'parameters': PARAMETERS})
+        with tempfile.TemporaryDirectory() as folder:
+            responses = asyncio.run(solve_through_server([request, '[1]', '"x"', '3'],
+                                                         os.path.join(folder, 'server.sock')))
+        self.assertEqual(len(responses), 4)
+        self.assertEqual(sum('error' in response for response in responses), 3)
+        self.assertIn(0, [response.get('id') for response in responses if 'solution' in response])
+
+
+if __name__ == "__main__":
+    unittest.main()
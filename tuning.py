@@ -0,0 +1,99 @@
+import itertools
+import math
+import random
+import genetic_algorithm
+import main
+import parallel_runner
+
+DEFAULT_CONFIGURATION = {'n_individuals': 50, 'n_iterations': 500, 'crossover_probability': 0.7,
+                         'mutation_probability': 0.06, 'satisfied_clause_bonus': 500, 'satisfied_formula_bonus': 1100}
+
+
+def grid(space):
+    """
+    returns all configurations of search space
+    :param space: dictionary of parameter names and lists of their values, missing parameters keep default values
+    :return: list of configurations (dictionaries of all parameters)
+    """
+    names = list(space)
+    configurations = []
+    for values in itertools.product(*[space[name] for name in names]):
+        configuration = dict(DEFAULT_CONFIGURATION)
+        configuration.update(zip(names, values))
+        configurations.append(configuration)
+    return configurations
+
+
+def sample(space, n_configurations, seed=None):
+    """
+    returns n random distinct configurations of search space (all of them, if the space is smaller)
+    """
+    configurations = grid(space)
+    if n_configurations >= len(configurations):
+        return configurations
+    return random.Random(seed).sample(configurations, n_configurations)
+
+
+def solve_configuration(filename, seed, configuration, configuration_index=None):
+    """
+    solves problem from file with given configuration of GA, used as a job of parallel runner
+    :param configuration_index: index of configuration, not used in solving, it identifies job, whose result returns
+    :return: True if solution was found
+    """
+    random.seed(seed)
+    instance = main.load_instance(filename)
+    if instance is None:
+        return False
+    solution = genetic_algorithm.run_and_set_bonuses(instance, configuration['n_individuals'],
+                                                     configuration['n_iterations'],
+                                                     configuration['crossover_probability'],
+                                                     configuration['mutation_probability'],
+                                                     configuration['satisfied_clause_bonus'],
+                                                     configuration['satisfied_formula_bonus'])
+    return solution is not None
+
+
+def successive_halving(configurations, filenames, eta=2, min_files=None, n_workers=None, seed=None):
+    """
+    evaluates configurations concurrently on growing subsets of files and after each round keeps only 1/eta of them
+    with best ratio of solved instances, so that clearly losing configurations are abandoned early
+    :param configurations: list of configurations
+    :param filenames: list of filenames, the first ones are used in early rounds
+    :param eta: how many times the number of configurations decreases and the number of files grows each round
+    :param min_files: number of files in the first round, chosen so that the last round uses all files if None
+    :param n_workers: number of processes evaluating in parallel, all cores if None
+    :param seed: seed, from which seeds of files are derived, same for all configurations
+    :return: list of results of all configurations, best first
+    """
+    if min_files is None:
+        n_rounds = max(1, math.ceil(math.log(len(configurations), eta))) if len(configurations) > 1 else 1
+        min_files = max(1, len(filenames) // eta ** (n_rounds - 1))
+    results = [{'configuration': configuration, 'n_solved': 0, 'n_runs': 0, 'round': 0}
+               for configuration in configurations]
+    alive, n_files, evaluated_files, round_number = list(range(len(configurations))), min_files, 0, 0
+
+    while True:
+        n_files = min(n_files, len(filenames))
+        jobs = []
+        for index in alive:
+            for file_index in range(evaluated_files, n_files):
+                file_seed = None if seed is None else parallel_runner.derive_seed(seed, file_index)
+                jobs.append((filenames[file_index], file_seed, configurations[index], index))
+        for job, solved in parallel_runner.run_jobs(solve_configuration, jobs, n_workers):
+            index = job[3]
+            results[index]['n_solved'] += solved
+            results[index]['n_runs'] += 1
+        evaluated_files = n_files
+        for index in alive:
+            results[index]['round'] = round_number
+            results[index]['ratio'] = results[index]['n_solved'] / results[index]['n_runs']
+            print(round_number, results[index]['configuration'], results[index]['ratio'])
+
+        if len(alive) == 1 or n_files == len(filenames):
+            break
+        alive.sort(key=lambda index: results[index]['ratio'], reverse=True)
+        alive = alive[:max(1, math.ceil(len(alive) / eta))]
+        n_files *= eta
+        round_number += 1
+
+    return sorted(results, key=lambda result: (result['round'], result['ratio']), reverse=True)